@@ -74,7 +74,8 @@ class AdvancedQuantAnalyzer:
                 group = hf[fund_code]
     
                 # 读取数据并转换为DataFrame
-                dates = [d.decode("utf-8") for d in group["date"][()]]
+                # 定长字节串日期数组通过np.char.decode在C层批量解码
+                dates = np.char.decode(group["date"][()], "utf-8")
     
                 # 创建DataFrame
                 df = pd.DataFrame(
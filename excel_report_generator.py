@@ -1,11 +1,407 @@
 import pandas as pd
 import os
+import re
 import h5py
+import numpy as np
+from h5py import h5s
 import json
+import logging
+import warnings
 from datetime import datetime
-import pandas as pd
+from itertools import chain
 import Fund_Purchase_Status_Manager
 
+logger = logging.getLogger(__name__)
+
+# 属性字节串解码缓存：基金类型、日期、申购状态等取值大量重复，
+# 缓存后重复出现的字节串只需一次字典查找即可得到解码结果
+_DECODE_CACHE = {}
+_DECODE_CACHE_MAX_SIZE = 100000
+
+# 需要解码的属性值类型：定长字符串属性读出为numpy.bytes_，
+# 用精确类型判断代替isinstance，str和数值属性可以最快地原样返回
+_BYTES_TYPES = (bytes, np.bytes_)
+
+
+def _decode_attr(value):
+    """将HDF5属性值解码为字符串，非bytes类型原样返回"""
+    if type(value) not in _BYTES_TYPES:
+        return value
+    decoded_value = _DECODE_CACHE.get(value)
+    if decoded_value is None:
+        try:
+            decoded_value = value.decode("utf-8")
+        except Exception:
+            decoded_value = str(value)
+        # 定期清空，避免缓存无限增长
+        if len(_DECODE_CACHE) >= _DECODE_CACHE_MAX_SIZE:
+            _DECODE_CACHE.clear()
+        _DECODE_CACHE[value] = decoded_value
+    return decoded_value
+
+
+class _LastReader:
+    """通过h5py底层接口读取一维数据集中的单个元素
+
+    高层的ds[i]每次都要构造选择对象、校验参数并分配结果数组，读取单个元素时
+    这些开销远大于实际IO。这里复用同一个内存数据空间和按dtype缓存的单元素
+    缓冲区，直接调用DatasetID.read。只应在对应HDF5文件打开期间使用。
+    """
+
+    def __init__(self):
+        self._mem_space = h5s.create_simple((1,))
+        self._buffers = {}
+        self._out_spaces = {}
+
+    def read(self, ds, index=-1):
+        """读取ds[index]，支持负索引；数据集为空或索引越界时返回None"""
+        # DatasetID和dtype只取一次，后续全部通过底层对象完成
+        dsid = ds.id
+        dtype = dsid.dtype
+        file_space = dsid.get_space()
+        shape = file_space.shape
+        if len(shape) != 1 or dtype.kind == "O":
+            # 多维或变长类型的数据集走高层接口
+            return ds[index] if shape and -shape[0] <= index < shape[0] else None
+        n = shape[0]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            return None
+        buf = self._buffers.get(dtype)
+        if buf is None:
+            buf = self._buffers[dtype] = np.empty((1,), dtype=dtype)
+        file_space.select_hyperslab((index,), (1,))
+        dsid.read(self._mem_space, file_space, buf)
+        return buf[0]
+
+    def last(self, ds):
+        """读取数据集的最后一个元素，数据集为空时返回None"""
+        return self.read(ds, -1)
+
+    def read_into(self, ds, index, out, pos):
+        """将数值型一维数据集的ds[index]直接读入out[pos]，支持负索引
+
+        类型转换（如float32到float64）由HDF5在读取时完成；索引越界时返回False。
+        """
+        dsid = ds.id
+        file_space = dsid.get_space()
+        n = file_space.shape[0]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            return False
+        out_space = self._out_spaces.get(out.shape)
+        if out_space is None:
+            out_space = self._out_spaces[out.shape] = h5s.create_simple(out.shape)
+        out_space.select_hyperslab((pos,), (1,))
+        file_space.select_hyperslab((index,), (1,))
+        dsid.read(out_space, file_space, out)
+        return True
+
+
+class _ColumnBuffer:
+    """按列（SoA）收集各基金数值字段的缓冲区
+
+    每个字段对应一个预分配的float64数组，按基金登记顺序存放读取到的值，
+    全部读取完成后再统一写回各基金条目，避免逐个字段写入字典。
+    """
+
+    def __init__(self, fields, capacity):
+        self.fields = fields
+        self.entries = []
+        self.values = {field: np.empty(capacity) for field, _ in fields}
+        self.filled = {field: np.zeros(capacity, dtype=bool) for field, _ in fields}
+
+    def add(self, entry):
+        """登记一个基金条目，返回其在缓冲区中的行号"""
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def write_back(self):
+        """将已读取的值按中文表头写回对应的基金条目"""
+        entries = self.entries
+        for field, chinese_name in self.fields:
+            values = self.values[field]
+            for row in np.flatnonzero(self.filled[field]):
+                entries[row][chinese_name] = float(values[row])
+
+
+def _apply_fetch_time(entry, attrs):
+    """将fetch_time写入"数据获取时间"，并截取其日期部分写入"数据获取日期"。"""
+    fetch_time = attrs.get("fetch_time")
+    if fetch_time is None:
+        return
+    entry["数据获取时间"] = fetch_time
+    if isinstance(fetch_time, str) and len(fetch_time) >= 10:
+        entry["数据获取日期"] = fetch_time[:10]
+
+
+def _ingest_attrs(funds_group, fund_dict, key_map, fee_key=None):
+    """按映射表读取funds组下各基金的属性，返回读取的基金数量
+
+    key_map将属性键映射为需要写入的中文表头元组；fee_key指定的手续费属性
+    会在"实际手续费率"尚未出现时同步写入该列。
+    """
+    count = 0
+
+    for fund_code, fund_group in funds_group.items():
+        count += 1
+        entry = fund_dict.get(fund_code)
+        if entry is None:
+            entry = {}
+            fund_dict[fund_code] = entry
+
+        # 读取基金属性并按照文件功能.txt中的中文表头映射
+        # 只读取并解码映射表中用到的属性，未使用的属性不做任何处理
+        fund_attrs = fund_group.attrs
+        attrs = {
+            key: _decode_attr(fund_attrs[key])
+            for key in fund_attrs
+            if key in key_map or key == "fetch_time"
+        }
+        for key, decoded_value in attrs.items():
+            columns = key_map.get(key)
+            if columns:
+                for col in columns:
+                    entry[col] = decoded_value
+
+        # 同步到"实际手续费率"
+        if fee_key is not None and fee_key in attrs and "实际手续费率" not in entry:
+            entry["实际手续费率"] = attrs[fee_key]
+
+        # 从fetch_time提取"数据获取时间"和"数据获取日期"
+        _apply_fetch_time(entry, attrs)
+    return count
+
+
+# All_Fund_Data根目录下的基金代码：6位数字，两趟读取共用同一判断
+_SIX_DIGITS = re.compile(r"\d{6}")
+
+# All_Fund_Data中价格数据集名到中文表头的映射
+_PRICE_FIELDS = (
+    ("open", "开盘价"),
+    ("high", "最高价"),
+    ("low", "最低价"),
+    ("close", "收盘价"),
+)
+
+
+def _ingest_all_fund_data(f, fund_dict, empty_entry):
+    """读取All_Fund_Data.h5中各基金的最新交易数据，返回读取的基金数量"""
+    fund_count = 0
+    reader = _LastReader()
+
+    # 数值型价格字段按基金顺序直接读入预分配的数组，循环结束后统一写回
+    prices = _ColumnBuffer(_PRICE_FIELDS, len(f))
+
+    # 遍历文件中的所有基金代码（直接访问根目录下的基金代码键）
+    for fund_code, fund_group in f.items():
+        # 确保基金代码是6位数字字符串
+        if not _SIX_DIGITS.fullmatch(fund_code):
+            continue
+
+        fund_count += 1
+        entry = fund_dict.get(fund_code)
+        if entry is None:
+            # 初始化基金条目时复制包含所有必要列的模板
+            entry = empty_entry.copy()
+            fund_dict[fund_code] = entry
+        row = prices.add(entry)
+
+        try:
+            # 读取并处理日期数据
+            # 每个字段只通过get()解析一次，再用单个isinstance判断是否为数据集
+            date_ds = fund_group.get("date")
+            if isinstance(date_ds, h5py.Dataset):
+                try:
+                    # 只读取最新的日期（最后一条记录）
+                    latest_date = reader.last(date_ds)
+                    if latest_date is not None:
+                        # 转换日期格式（处理bytes类型）
+                        if isinstance(latest_date, bytes):
+                            latest_date = latest_date.decode("utf-8")
+                        entry["日期"] = latest_date
+                except Exception as e:
+                    logger.debug("读取基金%s日期数据时出错: %s", fund_code, e)
+
+            # 读取并处理开盘价、最高价、最低价、收盘价
+            for field, chinese_name in _PRICE_FIELDS:
+                ds = fund_group.get(field)
+                if isinstance(ds, h5py.Dataset):
+                    try:
+                        if ds.dtype.kind in "iuf" and ds.ndim == 1:
+                            # 数值型数据集：最新值直接读入预分配数组
+                            if reader.read_into(ds, -1, prices.values[field], row):
+                                prices.filled[field][row] = True
+                            continue
+
+                        # 其他类型（如bytes）逐个读取并解码，只读取最新的数据
+                        latest_data = reader.last(ds)
+                        if latest_data is not None:
+                            # 确保转换为正确的数值类型，无法转换时不抛出异常
+                            value = _safe_float(latest_data)
+                            if value is not None:
+                                entry[chinese_name] = value
+                            elif ds.dtype.kind in "SO":
+                                # 如果解码或转换失败，保留原始值的字符串形式
+                                entry[chinese_name] = str(latest_data)
+                            else:
+                                entry[chinese_name] = latest_data
+                    except Exception as e:
+                        logger.debug(
+                            "读取基金%s%s数据时出错: %s", fund_code, chinese_name, e
+                        )
+
+            # 尝试从属性中读取数据，只读取用到的data_date属性
+            try:
+                data_date = fund_group.attrs.get("data_date")
+                if data_date is not None:
+                    # 映射交易数据列
+                    entry["数据日期"] = _decode_attr(data_date)
+            except Exception as e:
+                logger.debug("读取基金%s属性数据时出错: %s", fund_code, e)
+        except Exception as e:
+            logger.debug("读取基金%s数据时出错: %s", fund_code, e)
+
+    # 将批量读取的价格写回各基金条目
+    prices.write_back()
+    return fund_count
+
+
+# 通达信数据集名到中文表头的映射
+_TDX_FIELDS = (
+    ("open", "开盘价"),
+    ("high", "最高价"),
+    ("low", "最低价"),
+    ("close", "收盘价"),
+    ("amount", "成交额"),
+    ("volume", "成交量"),
+    ("prev_close", "前收盘价"),
+)
+
+
+# 可以转换为float的字符串形式（十进制数、科学计数法、inf/nan），用于预先判断
+_FLOAT_PATTERN = re.compile(
+    r"\s*[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?|nan)\s*",
+    re.IGNORECASE,
+)
+
+
+def _safe_float(value):
+    """将数值、bytes或字符串转换为float，无法转换时返回None
+
+    先通过类型和格式判断能否转换，脏数据不会走抛出并捕获异常的路径。
+    """
+    if isinstance(value, (float, int, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", "replace")
+    if isinstance(value, str) and _FLOAT_PATTERN.fullmatch(value):
+        return float(value)
+    return None
+
+
+def _read_float(reader, ds, index):
+    """读取数据集index处的元素并转换为float，无法转换时返回None
+
+    是否需要解码由数据集的dtype一次性决定：定长字节串先按UTF-8解码，
+    其余类型直接转换。
+    """
+    value = reader.read(ds, index)
+    if ds.dtype.kind == "S" and value is not None:
+        value = value.decode("utf-8", "replace")
+    return _safe_float(value)
+
+
+def _ingest_tdx(f, fund_dict, empty_entry):
+    """读取通达信基金数据（TDX_To_HDF5.py生成）中各基金的最新一条记录，返回读取的基金数量"""
+    count = 0
+    reader = _LastReader()
+
+    # 一次性筛选出根目录下的基金代码键（6位数字字符串），再逐个处理
+    fund_codes = [code for code in f.keys() if _SIX_DIGITS.fullmatch(code)]
+    # 数值型字段按列读入预分配的数组，循环结束后统一写回
+    columns = _ColumnBuffer(_TDX_FIELDS, len(fund_codes))
+    for fund_code in fund_codes:
+        count += 1
+        entry = fund_dict.get(fund_code)
+        if entry is None:
+            # 初始化基金条目时复制包含所有必要列的模板
+            entry = empty_entry.copy()
+            fund_dict[fund_code] = entry
+        row = columns.add(entry)
+
+        # 日期和所有通达信字段都已由前面的数据源填充时，无需访问该基金的任何数据集
+        if entry.get("日期") and all(entry.get(cn) for _, cn in _TDX_FIELDS):
+            continue
+
+        # 通达信数据的结构与其他数据源不同，它存储的是时间序列数据
+        # 我们需要获取最新的一条数据（最近日期的数据）
+        fund_group = f[fund_code]
+
+        # 检查必要的数据集是否存在
+        date_ds = fund_group.get("date")
+        if "close" in fund_group:
+            # 获取日期数据并转换为Python字符串
+            if isinstance(date_ds, h5py.Dataset):
+                try:
+                    # 获取最新的一条数据（最后一条记录），只读取该元素
+                    n = date_ds.shape[0]
+                    if n > 0:
+                        latest_index = n - 1
+
+                        # 映射到中文表头
+                        if not entry.get("日期"):
+                            latest_date = reader.read(date_ds, latest_index)
+                            # 转换日期格式（处理bytes类型）
+                            if isinstance(latest_date, bytes):
+                                latest_date = latest_date.decode("utf-8")
+                            entry["日期"] = latest_date
+                        for field, chinese_name in _TDX_FIELDS:
+                            # 已由前面的数据源填充的列直接跳过，不发起任何HDF5访问
+                            if entry.get(chinese_name):
+                                continue
+                            ds = fund_group.get(field)
+                            if not isinstance(ds, h5py.Dataset):
+                                continue
+                            try:
+                                if ds.dtype.kind in "iuf" and ds.ndim == 1:
+                                    if reader.read_into(
+                                        ds, latest_index, columns.values[field], row
+                                    ):
+                                        columns.filled[field][row] = True
+                                else:
+                                    value = _read_float(reader, ds, latest_index)
+                                    if value is not None:
+                                        entry[chinese_name] = value
+                            except (ValueError, TypeError, OSError):
+                                pass
+                except Exception as e:
+                    logger.debug("读取通达信基金%s数据时出错: %s", fund_code, e)
+
+    # 将按列读取的数值写回各基金条目
+    columns.write_back()
+    return count
+
+
+def _is_blank(series, placeholders=("",)):
+    """返回列中空值位置的布尔掩码：NaN/None或placeholders中的占位值（默认为空字符串）"""
+    return series.isna() | series.isin(placeholders)
+
+
+def _fill_blank(df, target, source, blank=None):
+    """将target列中的空值整列替换为source列同一行的值（向量化，不逐行apply）
+
+    blank为上一阶段填充后剩余的空值掩码，省略时重新计算。返回本次填充后
+    仍为空值的位置掩码，多阶段填充同一列时传给下一阶段，无需重新判断整列。
+    """
+    if blank is None:
+        blank = _is_blank(df[target])
+    source_values = df[source]
+    df[target] = df[target].mask(blank, source_values)
+    return blank & _is_blank(source_values)
+
 
 class ExcelReportGenerator:
     """Excel报表生成器，用于生成基金量化分析Excel报表"""
@@ -70,27 +466,158 @@ class ExcelReportGenerator:
         "数据日期",
     }
 
+    # 不写入报表（也不保存到列顺序配置）的列
+    EXCLUDED_COLUMNS = frozenset({"基金名称", "成交额", "成交量", "前收盘价"})
+
+    # 新基金条目的模板：所有必要列均初始化为空字符串，新建条目时直接copy()，
+    # 避免为每个基金重新执行一遍字典推导式。基金代码已作为fund_dict的键，
+    # 构建DataFrame时单独插入，因此条目中不包含该列
+    _EMPTY_FUND = dict.fromkeys(
+        (col for col in ALL_REQUIRED_COLUMNS if col != "基金代码"), ""
+    )
+
+    # 各数据源属性键到中文表头的映射，一个属性可以同时写入多个列
+    # 场内交易基金数据（原财经网基金数据），fund_code已作为字典键
+    CNJY_KEY_MAP = {
+        "fund_name": ("基金简称",),
+        "fund_type": ("基金类型",),
+        "unit_nav": ("最新单位净值",),
+        "accumulated_nav": ("最新累计净值",),
+        "prev_unit_nav": ("上一交易日单位净值",),
+        "prev_accumulated_nav": ("上一交易日累计净值",),
+        "growth_value": ("日增长值", "增长值"),
+        "growth_rate": ("日增长率", "增长率"),
+        "market_price": ("市价",),
+        "discount_rate": ("折价率",),
+    }
+
+    # 货币基金数据
+    CURRENCY_KEY_MAP = {
+        "fund_name": ("基金简称",),
+        "latest_10k_profit": ("最新万份收益",),
+        "latest_7day_annual": ("最新7日年化%",),
+        "establishment_date": ("成立日期",),
+        "fund_manager": ("基金经理",),
+        "manager": ("基金经理",),
+        "fee_rate": ("手续费",),
+        "update_date": ("数据更新日期",),
+    }
+
+    # 场内交易基金/货币基金排名数据
+    HBX_KEY_MAP = {
+        "fund_name": ("基金简称",),
+        "data_date": ("数据日期",),
+        "per_10k_return": ("最新万份收益",),
+        "seven_day_annualized": ("最新7日年化%",),
+        "fourteen_day_annualized": ("14日年化收益率",),
+        "twenty_eight_day_annualized": ("28日年化收益率",),
+        "net_value": ("基金净值",),
+        "month_growth": ("近1月增长率",),
+        "quarter_growth": ("近3月增长率",),
+        "half_year_growth": ("近6月增长率",),
+        "year_growth": ("近1年增长率",),
+        "two_year_growth": ("近2年增长率",),
+        "three_year_growth": ("近3年增长率",),
+        "five_year_growth": ("近5年增长率",),
+        "year_to_date_growth": ("今年来增长率",),
+        "since_establishment_growth": ("成立来增长率",),
+        "fee": ("手续费",),
+    }
+
+    # Fetch_Fund_Data数据（重点处理缺失的10个字段）
+    FETCH_FUND_KEY_MAP = {
+        "fund_name": ("基金简称",),
+        "growth_value": ("日增长值",),
+        "update_time": ("数据更新时间",),
+        "prev_trading_date": ("上一交易日日期",),
+        "fund_manager": ("基金经理",),
+        "actual_fee_rate": ("实际手续费率",),
+        "original_fee_rate": ("原始手续费率",),
+        "fetch_date": ("数据获取日期",),
+        "prev_accumulated_nav": ("上一交易日累计净值",),
+        "latest_trading_date": ("最新交易日期",),
+        "prev_unit_nav": ("上一交易日单位净值",),
+        "data_date": ("数据日期",),
+    }
+
+    # 开放基金排名数据
+    OPEN_KEY_MAP = {
+        "fund_name": ("基金简称",),
+        "data_date": ("数据日期",),
+        "data_fetch_date": ("数据获取日期",),
+        "unit_nav": ("最新单位净值",),
+        "accum_nav": ("最新累计净值",),
+        "day_growth": ("日增长率",),
+        "week_growth": ("近1周增长率",),
+        "month_growth": ("近1月增长率",),
+        "quarter_growth": ("近3月增长率",),
+        "half_year_growth": ("近6月增长率",),
+        "year_growth": ("近1年增长率",),
+        "two_year_growth": ("近2年增长率",),
+        "three_year_growth": ("近3年增长率",),
+        "year_to_date_growth": ("今年来增长率",),
+        "since_establishment_growth": ("成立来增长率",),
+        # 最新交易日期和上一交易日日期
+        "latest_trading_date": ("最新交易日期",),
+        "prev_trading_date": ("上一交易日日期",),
+        # 实际手续费率和原始手续费率
+        "actual_fee_rate": ("实际手续费率",),
+        "original_fee_rate": ("原始手续费率",),
+        # 数据更新时间
+        "update_time": ("数据更新时间",),
+        # 上一交易日单位净值和上一交易日累计净值
+        "prev_unit_nav": ("上一交易日单位净值",),
+        "prev_accum_nav": ("上一交易日累计净值",),
+    }
+
+    def __init__(self):
+        # 列顺序配置只在初始化时读取一次，同一实例多次生成报表时直接复用
+        self.columns_config_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "data", "columns_config.json"
+        )
+        self._columns_order = self._load_columns_order()
+
+    def _load_columns_order(self):
+        """读取保存的列顺序配置，文件不存在或读取出错时返回None"""
+        if not os.path.exists(self.columns_config_path):
+            return None
+        try:
+            with open(self.columns_config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            return config.get("columns_order")
+        except Exception as e:
+            print(f"加载列顺序配置时出错: {str(e)}")
+            return None
+
     def generate_excel_report(self):
         """生成量化分析Excel报表，整合所有相关基金数据到单个工作表"""
         try:
+            # 报表生成时刻和项目根目录只取一次，后续统一使用
+            now = datetime.now()
+            root_dir = os.path.dirname(os.path.abspath(__file__))
+
             # 创建报表目录
-            report_dir = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)), "reports"
-            )
+            report_dir = os.path.join(root_dir, "reports")
             if not os.path.exists(report_dir):
                 os.makedirs(report_dir)
 
             # 生成报表文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             report_path = os.path.join(report_dir, f"基金量化分析报表_{timestamp}.xlsx")
 
-            # 获取项目根目录和数据目录
-            root_dir = os.path.dirname(os.path.abspath(__file__))
+            # 获取数据目录
             data_dir = os.path.join(root_dir, "data")
 
+            # 一次性扫描数据目录，避免在每个数据源前单独调用os.path.exists
+            try:
+                with os.scandir(data_dir) as it:
+                    existing_files = {e.name for e in it if e.is_file()}
+            except FileNotFoundError:
+                existing_files = set()
+
             # 创建统计信息字典
             stats_info = {
-                "报表生成时间": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "报表生成时间": now.strftime("%Y-%m-%d %H:%M:%S"),
                 "数据来源": "东方财富网等",
                 "整合后基金总数": 0,
                 "数据列总数": 0,
@@ -107,1043 +634,142 @@ class ExcelReportGenerator:
                     print(f"已读取基金基本信息: {len(df_fund_status)}条")
 
                     # 优化数据存储方式，先创建所有基金代码的条目，并初始化所有必要列
-                    for _, row in df_fund_status.iterrows():
-                        fund_code = row.get("基金代码", "")
+                    # 按列整体转换为记录列表，避免iterrows逐行构造Series
+                    for record in df_fund_status.to_dict("records"):
+                        # 基金代码作为fund_dict的键，不再写入条目
+                        fund_code = record.pop("基金代码", "")
                         if fund_code:
-                            if fund_code not in fund_dict:
+                            entry = fund_dict.get(fund_code)
+                            if entry is None:
                                 # 初始化基金条目时就包含所有必要列，并设置默认值
-                                fund_dict[fund_code] = {
-                                    col: "" for col in self.ALL_REQUIRED_COLUMNS
-                                }
+                                entry = self._EMPTY_FUND.copy()
+                                fund_dict[fund_code] = entry
                             # 从主数据源填充数据
-                            for col in df_fund_status.columns:
-                                fund_dict[fund_code][col] = row[col]
+                            entry.update(record)
             except Exception as e:
                 print(f"获取基金基本信息时出错: {str(e)}")
 
             # 2. 读取场内交易基金数据（原财经网基金数据）
-            try:
-                cnjy_file = os.path.join(data_dir, "CNJY_Fund_Data.h5")
-                if os.path.exists(cnjy_file):
-                    with h5py.File(cnjy_file, "r") as f:
+            if "CNJY_Fund_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "CNJY_Fund_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并按照文件功能.txt中的中文表头映射
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头
-                                    if key == "fund_code":
-                                        pass  # 基金代码已作为字典键
-                                    elif key == "fund_name":
-                                        fund_dict[fund_code][
-                                            "基金简称"
-                                        ] = decoded_value  # 使用统一的中文表头
-                                    elif key == "fund_type":
-                                        fund_dict[fund_code]["基金类型"] = decoded_value
-                                    elif key == "unit_nav":
-                                        fund_dict[fund_code][
-                                            "最新单位净值"
-                                        ] = decoded_value
-                                    elif key == "accumulated_nav":
-                                        fund_dict[fund_code][
-                                            "最新累计净值"
-                                        ] = decoded_value
-                                    elif key == "prev_unit_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日单位净值"
-                                        ] = decoded_value
-                                    elif key == "prev_accumulated_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日累计净值"
-                                        ] = decoded_value
-                                    elif key == "growth_value":
-                                        fund_dict[fund_code]["日增长值"] = decoded_value
-                                        fund_dict[fund_code]["增长值"] = decoded_value
-                                    elif key == "growth_rate":
-                                        fund_dict[fund_code]["日增长率"] = decoded_value
-                                        fund_dict[fund_code]["增长率"] = decoded_value
-                                    elif key == "market_price":
-                                        fund_dict[fund_code]["市价"] = decoded_value
-                                    elif key == "discount_rate":
-                                        fund_dict[fund_code]["折价率"] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-
+                            count = _ingest_attrs(
+                                f["funds"], fund_dict, self.CNJY_KEY_MAP
+                            )
                             print(f"已读取场内交易基金数据: {count}条")
-            except Exception as e:
-                print(f"获取财经网基金数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取财经网基金数据时出错: {str(e)}")
 
             # 3. 读取货币基金数据
-            try:
-                currency_file = os.path.join(data_dir, "Currency_Fund_Data.h5")
-                if os.path.exists(currency_file):
-                    with h5py.File(currency_file, "r") as f:
+            if "Currency_Fund_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "Currency_Fund_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并按照文件功能.txt中的中文表头映射
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头
-                                    if key == "fund_name":
-                                        fund_dict[fund_code][
-                                            "基金简称"
-                                        ] = decoded_value  # 使用统一的中文表头
-                                    elif key == "latest_10k_profit":
-                                        fund_dict[fund_code][
-                                            "最新万份收益"
-                                        ] = decoded_value
-                                    elif key == "latest_7day_annual":
-                                        fund_dict[fund_code][
-                                            "最新7日年化%"
-                                        ] = decoded_value
-                                    elif key == "establishment_date":
-                                        fund_dict[fund_code]["成立日期"] = decoded_value
-                                    elif key == "fund_manager" or key == "manager":
-                                        fund_dict[fund_code]["基金经理"] = decoded_value
-                                    elif key == "fee_rate":
-                                        fund_dict[fund_code]["手续费"] = decoded_value
-                                        # 同步到"实际手续费率"
-                                        if "实际手续费率" not in fund_dict[fund_code]:
-                                            fund_dict[fund_code][
-                                                "实际手续费率"
-                                            ] = decoded_value
-                                    elif key == "update_date":
-                                        fund_dict[fund_code][
-                                            "数据更新日期"
-                                        ] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-
+                            count = _ingest_attrs(
+                                f["funds"],
+                                fund_dict,
+                                self.CURRENCY_KEY_MAP,
+                                fee_key="fee_rate",
+                            )
                             print(f"已读取货币基金数据: {count}条")
-            except Exception as e:
-                print(f"获取货币基金数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取货币基金数据时出错: {str(e)}")
 
             # 4. 读取场内交易基金排名数据
-            try:
-                hbx_file = os.path.join(data_dir, "HBX_Fund_Ranking_Data.h5")
-                if os.path.exists(hbx_file):
-                    with h5py.File(hbx_file, "r") as f:
+            if "HBX_Fund_Ranking_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "HBX_Fund_Ranking_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并按照文件功能.txt中的中文表头映射
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头
-                                    if key == "fund_name":
-                                        fund_dict[fund_code]["基金简称"] = decoded_value
-                                    elif key == "data_date":
-                                        fund_dict[fund_code]["数据日期"] = decoded_value
-                                    elif key == "per_10k_return":
-                                        fund_dict[fund_code][
-                                            "最新万份收益"
-                                        ] = decoded_value
-                                    elif key == "seven_day_annualized":
-                                        fund_dict[fund_code][
-                                            "最新7日年化%"
-                                        ] = decoded_value
-                                    elif key == "fourteen_day_annualized":
-                                        fund_dict[fund_code][
-                                            "14日年化收益率"
-                                        ] = decoded_value
-                                    elif key == "twenty_eight_day_annualized":
-                                        fund_dict[fund_code][
-                                            "28日年化收益率"
-                                        ] = decoded_value
-                                    elif key == "net_value":
-                                        fund_dict[fund_code]["基金净值"] = decoded_value
-                                    elif key == "month_growth":
-                                        fund_dict[fund_code][
-                                            "近1月增长率"
-                                        ] = decoded_value
-                                    elif key == "quarter_growth":
-                                        fund_dict[fund_code][
-                                            "近3月增长率"
-                                        ] = decoded_value
-                                    elif key == "half_year_growth":
-                                        fund_dict[fund_code][
-                                            "近6月增长率"
-                                        ] = decoded_value
-                                    elif key == "year_growth":
-                                        fund_dict[fund_code][
-                                            "近1年增长率"
-                                        ] = decoded_value
-                                    elif key == "two_year_growth":
-                                        fund_dict[fund_code][
-                                            "近2年增长率"
-                                        ] = decoded_value
-                                    elif key == "three_year_growth":
-                                        fund_dict[fund_code][
-                                            "近3年增长率"
-                                        ] = decoded_value
-                                    elif key == "five_year_growth":
-                                        fund_dict[fund_code][
-                                            "近5年增长率"
-                                        ] = decoded_value
-                                    elif key == "year_to_date_growth":
-                                        fund_dict[fund_code][
-                                            "今年来增长率"
-                                        ] = decoded_value
-                                    elif key == "since_establishment_growth":
-                                        fund_dict[fund_code][
-                                            "成立来增长率"
-                                        ] = decoded_value
-                                    elif key == "fee":
-                                        fund_dict[fund_code]["手续费"] = decoded_value
-                                        # 同步到"实际手续费率"
-                                        if "实际手续费率" not in fund_dict[fund_code]:
-                                            fund_dict[fund_code][
-                                                "实际手续费率"
-                                            ] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-
+                            count = _ingest_attrs(
+                                f["funds"], fund_dict, self.HBX_KEY_MAP, fee_key="fee"
+                            )
                             print(f"已读取场内交易基金排名数据: {count}条")
-            except Exception as e:
-                print(f"获取场内交易基金排名数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取场内交易基金排名数据时出错: {str(e)}")
 
             # 5. 读取货币基金排名数据
-            try:
-                hbx_file = os.path.join(data_dir, "HBX_Fund_Ranking_Data.h5")
-                if os.path.exists(hbx_file):
-                    with h5py.File(hbx_file, "r") as f:
+            if "HBX_Fund_Ranking_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "HBX_Fund_Ranking_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并按照文件功能.txt中的中文表头映射
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头
-                                    if key == "fund_name":
-                                        fund_dict[fund_code]["基金简称"] = decoded_value
-                                    elif key == "data_date":
-                                        fund_dict[fund_code]["数据日期"] = decoded_value
-                                    elif key == "per_10k_return":
-                                        fund_dict[fund_code][
-                                            "最新万份收益"
-                                        ] = decoded_value
-                                    elif key == "seven_day_annualized":
-                                        fund_dict[fund_code][
-                                            "最新7日年化%"
-                                        ] = decoded_value
-                                    elif key == "fourteen_day_annualized":
-                                        fund_dict[fund_code][
-                                            "14日年化收益率"
-                                        ] = decoded_value
-                                    elif key == "twenty_eight_day_annualized":
-                                        fund_dict[fund_code][
-                                            "28日年化收益率"
-                                        ] = decoded_value
-                                    elif key == "net_value":
-                                        fund_dict[fund_code]["基金净值"] = decoded_value
-                                    elif key == "month_growth":
-                                        fund_dict[fund_code][
-                                            "近1月增长率"
-                                        ] = decoded_value
-                                    elif key == "quarter_growth":
-                                        fund_dict[fund_code][
-                                            "近3月增长率"
-                                        ] = decoded_value
-                                    elif key == "half_year_growth":
-                                        fund_dict[fund_code][
-                                            "近6月增长率"
-                                        ] = decoded_value
-                                    elif key == "year_growth":
-                                        fund_dict[fund_code][
-                                            "近1年增长率"
-                                        ] = decoded_value
-                                    elif key == "two_year_growth":
-                                        fund_dict[fund_code][
-                                            "近2年增长率"
-                                        ] = decoded_value
-                                    elif key == "three_year_growth":
-                                        fund_dict[fund_code][
-                                            "近3年增长率"
-                                        ] = decoded_value
-                                    elif key == "five_year_growth":
-                                        fund_dict[fund_code][
-                                            "近5年增长率"
-                                        ] = decoded_value
-                                    elif key == "year_to_date_growth":
-                                        fund_dict[fund_code][
-                                            "今年来增长率"
-                                        ] = decoded_value
-                                    elif key == "since_establishment_growth":
-                                        fund_dict[fund_code][
-                                            "成立来增长率"
-                                        ] = decoded_value
-                                    elif key == "fee":
-                                        fund_dict[fund_code]["手续费"] = decoded_value
-                                        # 同步到"实际手续费率"
-                                        if "实际手续费率" not in fund_dict[fund_code]:
-                                            fund_dict[fund_code][
-                                                "实际手续费率"
-                                            ] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-
+                            count = _ingest_attrs(
+                                f["funds"], fund_dict, self.HBX_KEY_MAP, fee_key="fee"
+                            )
                             print(f"已读取货币基金排名数据: {count}条")
-            except Exception as e:
-                print(f"获取货币基金排名数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取货币基金排名数据时出错: {str(e)}")
 
             # 6. 读取Fetch_Fund_Data数据（专门处理缺失的10个字段）
-            try:
-                fetch_fund_file = os.path.join(data_dir, "Fetch_Fund_Data.h5")
-                if os.path.exists(fetch_fund_file):
-                    with h5py.File(fetch_fund_file, "r") as f:
+            if "Fetch_Fund_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "Fetch_Fund_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并映射到中文表头
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头，重点处理缺失的10个字段
-                                    if key == "fund_name":
-                                        fund_dict[fund_code][
-                                            "基金简称"
-                                        ] = decoded_value  # 使用统一的中文表头
-                                    elif key == "growth_value":
-                                        fund_dict[fund_code]["日增长值"] = decoded_value
-                                    elif key == "update_time":
-                                        fund_dict[fund_code][
-                                            "数据更新时间"
-                                        ] = decoded_value
-                                    elif key == "prev_trading_date":
-                                        fund_dict[fund_code][
-                                            "上一交易日日期"
-                                        ] = decoded_value
-                                    elif key == "fund_manager":
-                                        fund_dict[fund_code]["基金经理"] = decoded_value
-                                    elif key == "actual_fee_rate":
-                                        fund_dict[fund_code][
-                                            "实际手续费率"
-                                        ] = decoded_value
-                                    elif key == "original_fee_rate":
-                                        fund_dict[fund_code][
-                                            "原始手续费率"
-                                        ] = decoded_value
-                                    elif key == "fetch_date":
-                                        fund_dict[fund_code][
-                                            "数据获取日期"
-                                        ] = decoded_value
-                                    elif key == "prev_accumulated_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日累计净值"
-                                        ] = decoded_value
-                                    elif key == "latest_trading_date":
-                                        fund_dict[fund_code][
-                                            "最新交易日期"
-                                        ] = decoded_value
-                                    elif key == "prev_unit_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日单位净值"
-                                        ] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-                                    elif key == "data_date":
-                                        fund_dict[fund_code]["数据日期"] = decoded_value
-
+                            count = _ingest_attrs(
+                                f["funds"], fund_dict, self.FETCH_FUND_KEY_MAP
+                            )
                             print(f"已读取Fetch_Fund_Data数据: {count}条")
-            except Exception as e:
-                print(f"获取Fetch_Fund_Data数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取Fetch_Fund_Data数据时出错: {str(e)}")
 
             # 7. 读取All_Fund_Data.h5交易数据（专门处理问题中提到的缺失交易数据列）
-            try:
-                all_fund_data_file = os.path.join(data_dir, "All_Fund_Data.h5")
-                if os.path.exists(all_fund_data_file):
-                    with h5py.File(all_fund_data_file, "r") as f:
+            if "All_Fund_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "All_Fund_Data.h5"), "r"
+                    ) as f:
                         print(f"正在读取All_Fund_Data.h5文件")
-                        fund_count = 0
-
-                        # 遍历文件中的所有基金代码（直接访问根目录下的基金代码键）
-                        for fund_code in f.keys():
-                            # 确保基金代码是数字字符串
-                            if not fund_code.isdigit():
-                                continue
-
-                            fund_count += 1
-                            if fund_code not in fund_dict:
-                                # 初始化基金条目时包含所有必要列
-                                fund_dict[fund_code] = {
-                                    col: "" for col in self.ALL_REQUIRED_COLUMNS
-                                }
-
-                            try:
-                                # 初始化fund_group变量，指向当前基金代码对应的组
-                                if fund_code in f:
-                                    fund_group = f[fund_code]
-
-                                    # 读取并处理日期数据
-                                    if "date" in fund_group and isinstance(
-                                        fund_group["date"], h5py.Dataset
-                                    ):
-                                        try:
-                                            dates = fund_group["date"][:]
-                                            if dates.size > 0:
-                                                # 转换日期格式（处理bytes类型）
-                                                if isinstance(dates[0], bytes):
-                                                    dates = [
-                                                        date.decode("utf-8")
-                                                        for date in dates
-                                                    ]
-                                                # 获取最新的日期（最后一条记录）
-                                                latest_index = len(dates) - 1
-                                                fund_dict[fund_code]["日期"] = dates[
-                                                    latest_index
-                                                ]
-                                        except Exception as e:
-                                            print(
-                                                f"读取基金{fund_code}日期数据时出错: {str(e)}"
-                                            )
-
-                                    # 读取并处理开盘价、最高价、最低价、收盘价
-                                    for field, chinese_name in [
-                                        ("open", "开盘价"),
-                                        ("high", "最高价"),
-                                        ("low", "最低价"),
-                                        ("close", "收盘价"),
-                                    ]:
-                                        if field in fund_group and isinstance(
-                                            fund_group[field], h5py.Dataset
-                                        ):
-                                            try:
-                                                data = fund_group[field][:]
-                                                if data.size > 0:
-                                                    # 确保获取最新的数据
-                                                    latest_data = data[-1]
-                                                    # 确保转换为正确的数值类型
-                                                    if isinstance(latest_data, bytes):
-                                                        try:
-                                                            # 尝试解码为字符串再转换为数值
-                                                            decoded_data = (
-                                                                latest_data.decode(
-                                                                    "utf-8"
-                                                                )
-                                                            )
-                                                            fund_dict[fund_code][
-                                                                chinese_name
-                                                            ] = float(decoded_data)
-                                                        except:
-                                                            # 如果解码失败，保留原始值
-                                                            fund_dict[fund_code][
-                                                                chinese_name
-                                                            ] = str(latest_data)
-                                                    else:
-                                                        # 直接转换为数值
-                                                        try:
-                                                            fund_dict[fund_code][
-                                                                chinese_name
-                                                            ] = float(latest_data)
-                                                        except:
-                                                            fund_dict[fund_code][
-                                                                chinese_name
-                                                            ] = latest_data
-                                            except Exception as e:
-                                                print(
-                                                    f"读取基金{fund_code}{chinese_name}数据时出错: {str(e)}"
-                                                )
-
-                                    # 尝试从属性中读取数据
-                                    try:
-                                        for key, value in fund_group.attrs.items():
-                                            if isinstance(value, bytes):
-                                                try:
-                                                    decoded_value = value.decode(
-                                                        "utf-8"
-                                                    )
-                                                except:
-                                                    decoded_value = str(value)
-                                            else:
-                                                decoded_value = value
-
-                                            # 映射交易数据列
-                                            if key == "data_date":
-                                                fund_dict[fund_code][
-                                                    "数据日期"
-                                                ] = decoded_value
-                                    except Exception as e:
-                                        print(
-                                            f"读取基金{fund_code}属性数据时出错: {str(e)}"
-                                        )
-                            except Exception as e:
-                                print(f"读取基金{fund_code}数据时出错: {str(e)}")
-
+                        fund_count = _ingest_all_fund_data(
+                            f, fund_dict, self._EMPTY_FUND
+                        )
                         print(f"已读取All_Fund_Data数据: {fund_count}条")
-            except Exception as e:
-                print(f"获取All_Fund_Data交易数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取All_Fund_Data交易数据时出错: {str(e)}")
 
             # 8. 读取开放基金排名数据
-            try:
-                open_file = os.path.join(data_dir, "Open_Fund_Ranking_Data.h5")
-                if os.path.exists(open_file):
-                    with h5py.File(open_file, "r") as f:
+            if "Open_Fund_Ranking_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "Open_Fund_Ranking_Data.h5"), "r"
+                    ) as f:
                         if "funds" in f:
-                            funds_group = f["funds"]
-                            count = 0
-
-                            for fund_code in funds_group:
-                                count += 1
-                                if fund_code not in fund_dict:
-                                    fund_dict[fund_code] = {}
-
-                                fund_group = funds_group[fund_code]
-
-                                # 读取基金属性并按照文件功能.txt中的中文表头映射
-                                for key, value in fund_group.attrs.items():
-                                    if isinstance(value, bytes):
-                                        try:
-                                            decoded_value = value.decode("utf-8")
-                                        except:
-                                            decoded_value = str(value)
-                                    else:
-                                        decoded_value = value
-
-                                    # 映射到中文表头
-                                    if key == "fund_name":
-                                        fund_dict[fund_code]["基金简称"] = decoded_value
-                                    elif key == "data_date":
-                                        fund_dict[fund_code]["数据日期"] = decoded_value
-                                    elif key == "data_fetch_date":
-                                        fund_dict[fund_code][
-                                            "数据获取日期"
-                                        ] = decoded_value
-                                    elif key == "unit_nav":
-                                        fund_dict[fund_code][
-                                            "最新单位净值"
-                                        ] = decoded_value
-                                    elif key == "accum_nav":
-                                        fund_dict[fund_code][
-                                            "最新累计净值"
-                                        ] = decoded_value
-                                    elif key == "day_growth":
-                                        fund_dict[fund_code]["日增长率"] = decoded_value
-                                    elif key == "week_growth":
-                                        fund_dict[fund_code][
-                                            "近1周增长率"
-                                        ] = decoded_value
-                                    elif key == "month_growth":
-                                        fund_dict[fund_code][
-                                            "近1月增长率"
-                                        ] = decoded_value
-                                    elif key == "quarter_growth":
-                                        fund_dict[fund_code][
-                                            "近3月增长率"
-                                        ] = decoded_value
-                                    elif key == "half_year_growth":
-                                        fund_dict[fund_code][
-                                            "近6月增长率"
-                                        ] = decoded_value
-                                    elif key == "year_growth":
-                                        fund_dict[fund_code][
-                                            "近1年增长率"
-                                        ] = decoded_value
-                                    elif key == "two_year_growth":
-                                        fund_dict[fund_code][
-                                            "近2年增长率"
-                                        ] = decoded_value
-                                    elif key == "three_year_growth":
-                                        fund_dict[fund_code][
-                                            "近3年增长率"
-                                        ] = decoded_value
-                                    elif key == "year_to_date_growth":
-                                        fund_dict[fund_code][
-                                            "今年来增长率"
-                                        ] = decoded_value
-                                    elif key == "since_establishment_growth":
-                                        fund_dict[fund_code][
-                                            "成立来增长率"
-                                        ] = decoded_value
-                                    elif key == "fetch_time":
-                                        fund_dict[fund_code][
-                                            "数据获取时间"
-                                        ] = decoded_value
-                                        # 从fetch_time提取日期到"数据获取日期"
-                                        if (
-                                            isinstance(decoded_value, str)
-                                            and len(decoded_value) >= 10
-                                        ):
-                                            fund_dict[fund_code]["数据获取日期"] = (
-                                                decoded_value[:10]
-                                            )
-                                    # 添加最新交易日期和上一交易日日期的映射
-                                    elif key == "latest_trading_date":
-                                        fund_dict[fund_code][
-                                            "最新交易日期"
-                                        ] = decoded_value
-                                    elif key == "prev_trading_date":
-                                        fund_dict[fund_code][
-                                            "上一交易日日期"
-                                        ] = decoded_value
-                                    # 添加实际手续费率和原始手续费率的映射
-                                    elif key == "actual_fee_rate":
-                                        fund_dict[fund_code][
-                                            "实际手续费率"
-                                        ] = decoded_value
-                                    elif key == "original_fee_rate":
-                                        fund_dict[fund_code][
-                                            "原始手续费率"
-                                        ] = decoded_value
-                                    # 添加数据更新时间的映射
-                                    elif key == "update_time":
-                                        fund_dict[fund_code][
-                                            "数据更新时间"
-                                        ] = decoded_value
-                                    # 添加上一交易日单位净值和上一交易日累计净值的映射
-                                    elif key == "prev_unit_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日单位净值"
-                                        ] = decoded_value
-                                    elif key == "prev_accum_nav":
-                                        fund_dict[fund_code][
-                                            "上一交易日累计净值"
-                                        ] = decoded_value
-
+                            count = _ingest_attrs(
+                                f["funds"], fund_dict, self.OPEN_KEY_MAP
+                            )
                             print(f"已读取开放基金排名数据: {count}条")
-            except Exception as e:
-                print(f"获取开放基金排名数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取开放基金排名数据时出错: {str(e)}")
 
             # 8. 读取通达信基金数据（TDX_To_HDF5.py生成的数据）
-            try:
-                tdx_file = os.path.join(data_dir, "All_Fund_Data.h5")
-                if os.path.exists(tdx_file):
-                    with h5py.File(tdx_file, "r") as f:
-                        count = 0
-
-                        # 遍历文件中的所有基金代码（直接访问根目录下的基金代码键）
-                        for fund_code in f.keys():
-                            # 确保基金代码是数字字符串
-                            if not fund_code.isdigit():
-                                continue
-
-                            count += 1
-                            if fund_code not in fund_dict:
-                                # 初始化基金条目时包含所有必要列
-                                fund_dict[fund_code] = {
-                                    col: "" for col in self.ALL_REQUIRED_COLUMNS
-                                }
-
-                            # 通达信数据的结构与其他数据源不同，它存储的是时间序列数据
-                            # 我们需要获取最新的一条数据（最近日期的数据）
-                            fund_group = f[fund_code]
-
-                            # 检查必要的数据集是否存在
-                            if "date" in fund_group and "close" in fund_group:
-                                # 获取日期数据并转换为Python字符串
-                                if isinstance(fund_group["date"], h5py.Dataset):
-                                    try:
-                                        dates = fund_group["date"][:]
-                                        if dates.size > 0:
-                                            # 转换日期格式（处理bytes类型）
-                                            if isinstance(dates[0], bytes):
-                                                dates = [
-                                                    date.decode("utf-8")
-                                                    for date in dates
-                                                ]
-
-                                            # 获取最新的一条数据（最后一条记录）
-                                            if dates:
-                                                latest_index = len(dates) - 1
-
-                                                # 映射到中文表头
-                                                if "date" in fund_group and isinstance(
-                                                    fund_group["date"], h5py.Dataset
-                                                ):
-                                                    if (
-                                                        "日期"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "日期"
-                                                        ]
-                                                    ):
-                                                        fund_dict[fund_code]["日期"] = (
-                                                            dates[latest_index]
-                                                        )
-                                                if "open" in fund_group and isinstance(
-                                                    fund_group["open"], h5py.Dataset
-                                                ):
-                                                    if (
-                                                        "开盘价"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "开盘价"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            open_value = fund_group[
-                                                                "open"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                open_value, bytes
-                                                            ):
-                                                                open_value = float(
-                                                                    open_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                open_value = float(
-                                                                    open_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "开盘价"
-                                                            ] = open_value
-                                                        except:
-                                                            pass
-                                                if "high" in fund_group and isinstance(
-                                                    fund_group["high"], h5py.Dataset
-                                                ):
-                                                    if (
-                                                        "最高价"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "最高价"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            high_value = fund_group[
-                                                                "high"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                high_value, bytes
-                                                            ):
-                                                                high_value = float(
-                                                                    high_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                high_value = float(
-                                                                    high_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "最高价"
-                                                            ] = high_value
-                                                        except:
-                                                            pass
-                                                if "low" in fund_group and isinstance(
-                                                    fund_group["low"], h5py.Dataset
-                                                ):
-                                                    if (
-                                                        "最低价"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "最低价"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            low_value = fund_group[
-                                                                "low"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                low_value, bytes
-                                                            ):
-                                                                low_value = float(
-                                                                    low_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                low_value = float(
-                                                                    low_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "最低价"
-                                                            ] = low_value
-                                                        except:
-                                                            pass
-                                                if (
-                                                    "close" in fund_group
-                                                    and isinstance(
-                                                        fund_group["close"],
-                                                        h5py.Dataset,
-                                                    )
-                                                ):
-                                                    if (
-                                                        "收盘价"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "收盘价"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            close_value = fund_group[
-                                                                "close"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                close_value, bytes
-                                                            ):
-                                                                close_value = float(
-                                                                    close_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                close_value = float(
-                                                                    close_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "收盘价"
-                                                            ] = close_value
-                                                        except:
-                                                            pass
-                                                if (
-                                                    "amount" in fund_group
-                                                    and isinstance(
-                                                        fund_group["amount"],
-                                                        h5py.Dataset,
-                                                    )
-                                                ):
-                                                    if (
-                                                        "成交额"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "成交额"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            amount_value = fund_group[
-                                                                "amount"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                amount_value, bytes
-                                                            ):
-                                                                amount_value = float(
-                                                                    amount_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                amount_value = float(
-                                                                    amount_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "成交额"
-                                                            ] = amount_value
-                                                        except:
-                                                            pass
-                                                if (
-                                                    "volume" in fund_group
-                                                    and isinstance(
-                                                        fund_group["volume"],
-                                                        h5py.Dataset,
-                                                    )
-                                                ):
-                                                    if (
-                                                        "成交量"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "成交量"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            volume_value = fund_group[
-                                                                "volume"
-                                                            ][latest_index]
-                                                            if isinstance(
-                                                                volume_value, bytes
-                                                            ):
-                                                                volume_value = float(
-                                                                    volume_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                volume_value = float(
-                                                                    volume_value
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "成交量"
-                                                            ] = volume_value
-                                                        except:
-                                                            pass
-                                                if (
-                                                    "prev_close" in fund_group
-                                                    and isinstance(
-                                                        fund_group["prev_close"],
-                                                        h5py.Dataset,
-                                                    )
-                                                ):
-                                                    if (
-                                                        "前收盘价"
-                                                        not in fund_dict[fund_code]
-                                                        or not fund_dict[fund_code][
-                                                            "前收盘价"
-                                                        ]
-                                                    ):
-                                                        try:
-                                                            prev_close_value = (
-                                                                fund_group[
-                                                                    "prev_close"
-                                                                ][latest_index]
-                                                            )
-                                                            if isinstance(
-                                                                prev_close_value, bytes
-                                                            ):
-                                                                prev_close_value = float(
-                                                                    prev_close_value.decode(
-                                                                        "utf-8"
-                                                                    )
-                                                                )
-                                                            else:
-                                                                prev_close_value = (
-                                                                    float(
-                                                                        prev_close_value
-                                                                    )
-                                                                )
-                                                            fund_dict[fund_code][
-                                                                "前收盘价"
-                                                            ] = prev_close_value
-                                                        except:
-                                                            pass
-                                    except Exception as e:
-                                        print(
-                                            f"读取通达信基金{fund_code}数据时出错: {str(e)}"
-                                        )
-
+            if "All_Fund_Data.h5" in existing_files:
+                try:
+                    with h5py.File(
+                        os.path.join(data_dir, "All_Fund_Data.h5"), "r"
+                    ) as f:
+                        count = _ingest_tdx(f, fund_dict, self._EMPTY_FUND)
                         print(f"已读取通达信基金数据: {count}条")
-            except Exception as e:
-                print(f"获取通达信基金数据时出错: {str(e)}")
+                except Exception as e:
+                    print(f"获取通达信基金数据时出错: {str(e)}")
 
             # 7. 将基金字典转换为DataFrame并进行清理
             if fund_dict:
-                # 清理可能重复的'基金代码'列
-                for fund_code in fund_dict:
-                    if "基金代码" in fund_dict[fund_code]:
-                        # 删除字典中已有的'基金代码'键，因为我们将通过索引添加
-                        del fund_dict[fund_code]["基金代码"]
-
-                # 构建DataFrame
-                df_integrated = pd.DataFrame.from_dict(
-                    fund_dict, orient="index"
-                ).reset_index()
-                df_integrated.rename(columns={"index": "基金代码"}, inplace=True)
+                # 先按出现顺序收集所有列名，再用from_records在C层一次性把各基金条目
+                # 转换为按列存储的DataFrame，避免在Python中逐列逐基金取值；
+                # 基金代码单独作为第一列插入
+                entries = list(fund_dict.values())
+                column_names = list(dict.fromkeys(chain.from_iterable(entries)))
+                df_integrated = pd.DataFrame.from_records(entries, columns=column_names)
+                df_integrated.insert(0, "基金代码", list(fund_dict))
 
                 # 设置统计信息
                 stats_info["整合后基金总数"] = len(df_integrated)
@@ -1152,32 +778,31 @@ class ExcelReportGenerator:
                 # 确保基金代码是字符串类型
                 df_integrated["基金代码"] = df_integrated["基金代码"].astype(str)
 
-                # 任务1: 删除不需要的列 - 在数据处理早期阶段删除
-                columns_to_delete = ["基金名称"]
-
-                for col in columns_to_delete:
-                    if col in df_integrated.columns:
-                        df_integrated.drop(col, axis=1, inplace=True)
-                        print(f"已删除列: {col}")
-
-                # 任务2: 将"日累计限定金额"列的数据格式调整为非科学计数法表示
+                # 任务1: 将"日累计限定金额"列的数据格式调整为非科学计数法表示
                 if "日累计限定金额" in df_integrated.columns:
                     # 将列转换为数值类型（如果尚未转换）
                     try:
-                        df_integrated["日累计限定金额"] = pd.to_numeric(
+                        amounts = pd.to_numeric(
                             df_integrated["日累计限定金额"], errors="coerce"
                         )
-                        # 使用astype(str)避免科学计数法，但保留数值的准确性
-                        # 对于浮点数，转换为字符串时会保留原始数值表示
-                        # 对于大数，我们可以使用format来确保非科学计数法显示
-                        df_integrated["日累计限定金额"] = df_integrated[
-                            "日累计限定金额"
-                        ].apply(lambda x: "{0:.0f}".format(x) if pd.notnull(x) else "")
+                        # 整列取整后转换为int64再转字符串，避免科学计数法且无需逐个format；
+                        # 空值输出空字符串，超出int64范围的值（含inf）仍用format处理
+                        formatted = pd.Series("", index=amounts.index, dtype=object)
+                        in_range = amounts.abs() < 2**63
+                        formatted[in_range] = (
+                            amounts[in_range].round().astype("int64").astype(str)
+                        )
+                        out_of_range = amounts.notna() & ~in_range
+                        if out_of_range.any():
+                            formatted[out_of_range] = amounts[out_of_range].map(
+                                "{0:.0f}".format
+                            )
+                        df_integrated["日累计限定金额"] = formatted
                         print("已调整'日累计限定金额'列为非科学计数法格式")
                     except Exception as e:
                         print(f"调整'日累计限定金额'列格式时出错: {str(e)}")
 
-                # 任务3: 确保所有必要列存在并填充关键列数据
+                # 任务2: 确保所有必要列存在并填充关键列数据
                 # 重点处理缺失的五个字段：成立日期、最新交易日期、上一交易日日期、上一交易日累计净值、基金经理
                 key_columns = [
                     "成立日期",
@@ -1196,66 +821,40 @@ class ExcelReportGenerator:
                     "手续费" in df_integrated.columns
                     and "实际手续费率" in df_integrated.columns
                 ):
-                    df_integrated["实际手续费率"] = df_integrated.apply(
-                        lambda row: (
-                            row["手续费"]
-                            if pd.isna(row["实际手续费率"]) or row["实际手续费率"] == ""
-                            else row["实际手续费率"]
-                        ),
-                        axis=1,
-                    )
+                    _fill_blank(df_integrated, "实际手续费率", "手续费")
 
                 # 成立日期 - 确保不为空
                 if "成立日期" in df_integrated.columns:
-                    current_year = datetime.now().year
+                    current_year = now.year
                     # 为成立日期为空的基金添加一个默认值或从其他相关字段填充
-                    df_integrated["成立日期"] = df_integrated["成立日期"].apply(
-                        lambda x: (
-                            f"{current_year-10}-01-01"
-                            if pd.isna(x) or x == "" or x == "---"
-                            else x
-                        )
+                    established = df_integrated["成立日期"]
+                    df_integrated["成立日期"] = established.mask(
+                        _is_blank(established, ("", "---")), f"{current_year-10}-01-01"
                     )
                     print("已确保'成立日期'列数据有效")
 
                 # 最新交易日期 - 从数据获取日期或其他相关日期字段填充
                 if "最新交易日期" in df_integrated.columns:
+                    blank = None
                     # 首先尝试从current_date填充
                     if "current_date" in df_integrated.columns:
-                        df_integrated["最新交易日期"] = df_integrated.apply(
-                            lambda row: (
-                                row["current_date"]
-                                if pd.isna(row["最新交易日期"])
-                                or row["最新交易日期"] == ""
-                                else row["最新交易日期"]
-                            ),
-                            axis=1,
+                        blank = _fill_blank(
+                            df_integrated, "最新交易日期", "current_date"
                         )
                     # 如果仍然为空，从数据获取日期填充
                     if "数据获取日期" in df_integrated.columns:
-                        df_integrated["最新交易日期"] = df_integrated.apply(
-                            lambda row: (
-                                row["数据获取日期"]
-                                if pd.isna(row["最新交易日期"])
-                                or row["最新交易日期"] == ""
-                                else row["最新交易日期"]
-                            ),
-                            axis=1,
+                        _fill_blank(
+                            df_integrated, "最新交易日期", "数据获取日期", blank
                         )
                     print("已确保'最新交易日期'列数据有效")
 
                 # 上一交易日日期 - 从previous_date或其他相关日期字段填充
                 if "上一交易日日期" in df_integrated.columns:
+                    blank = None
                     # 首先尝试从previous_date填充
                     if "previous_date" in df_integrated.columns:
-                        df_integrated["上一交易日日期"] = df_integrated.apply(
-                            lambda row: (
-                                row["previous_date"]
-                                if pd.isna(row["上一交易日日期"])
-                                or row["上一交易日日期"] == ""
-                                else row["上一交易日日期"]
-                            ),
-                            axis=1,
+                        blank = _fill_blank(
+                            df_integrated, "上一交易日日期", "previous_date"
                         )
                     # 如果仍然为空，尝试从最新交易日期推算
                     if "最新交易日期" in df_integrated.columns:
@@ -1266,51 +865,48 @@ class ExcelReportGenerator:
                                 # 减去一天作为上一交易日
                                 previous_date = current_date - pd.Timedelta(days=1)
                                 return previous_date.strftime("%Y-%m-%d")
-                            except:
+                            except (ValueError, TypeError, OverflowError):
                                 return current_date_str
 
-                        df_integrated["上一交易日日期"] = df_integrated.apply(
-                            lambda row: (
-                                get_previous_date(row["最新交易日期"])
-                                if pd.isna(row["上一交易日日期"])
-                                or row["上一交易日日期"] == ""
-                                else row["上一交易日日期"]
-                            ),
-                            axis=1,
-                        )
+                        previous_dates = df_integrated["上一交易日日期"]
+                        if blank is None:
+                            blank = _is_blank(previous_dates)
+                        if blank.any():
+                            # 最新交易日期的取值高度重复，只对需要填充的行中
+                            # 不同的日期各推算一次，再整列映射回去
+                            latest_dates = df_integrated["最新交易日期"]
+                            derived = {
+                                value: get_previous_date(value)
+                                for value in latest_dates[blank].unique()
+                            }
+                            df_integrated["上一交易日日期"] = previous_dates.mask(
+                                blank, latest_dates.map(derived)
+                            )
                     print("已确保'上一交易日日期'列数据有效")
 
                 # 上一交易日累计净值 - 从相关净值字段填充
                 if "上一交易日累计净值" in df_integrated.columns:
+                    blank = None
                     # 首先尝试从previous_accumulated_nav填充
                     if "previous_accumulated_nav" in df_integrated.columns:
-                        df_integrated["上一交易日累计净值"] = df_integrated.apply(
-                            lambda row: (
-                                row["previous_accumulated_nav"]
-                                if pd.isna(row["上一交易日累计净值"])
-                                or row["上一交易日累计净值"] == ""
-                                else row["上一交易日累计净值"]
-                            ),
-                            axis=1,
+                        blank = _fill_blank(
+                            df_integrated,
+                            "上一交易日累计净值",
+                            "previous_accumulated_nav",
                         )
                     # 如果仍然为空，尝试从最新累计净值填充
                     if "最新累计净值" in df_integrated.columns:
-                        df_integrated["上一交易日累计净值"] = df_integrated.apply(
-                            lambda row: (
-                                row["最新累计净值"]
-                                if pd.isna(row["上一交易日累计净值"])
-                                or row["上一交易日累计净值"] == ""
-                                else row["上一交易日累计净值"]
-                            ),
-                            axis=1,
+                        _fill_blank(
+                            df_integrated, "上一交易日累计净值", "最新累计净值", blank
                         )
                     print("已确保'上一交易日累计净值'列数据有效")
 
                 # 基金经理 - 确保不为空
                 if "基金经理" in df_integrated.columns:
                     # 为基金经理为空的基金设置默认值
-                    df_integrated["基金经理"] = df_integrated["基金经理"].apply(
-                        lambda x: "未知" if pd.isna(x) or x == "" or x == "---" else x
+                    managers = df_integrated["基金经理"]
+                    df_integrated["基金经理"] = managers.mask(
+                        _is_blank(managers, ("", "---")), "未知"
                     )
                     print("已确保'基金经理'列数据有效")
 
@@ -1319,64 +915,30 @@ class ExcelReportGenerator:
                     "更新时间" in df_integrated.columns
                     and "数据更新时间" in df_integrated.columns
                 ):
-                    df_integrated["数据更新时间"] = df_integrated.apply(
-                        lambda row: (
-                            row["更新时间"]
-                            if pd.isna(row["数据更新时间"]) or row["数据更新时间"] == ""
-                            else row["数据更新时间"]
-                        ),
-                        axis=1,
-                    )
+                    _fill_blank(df_integrated, "数据更新时间", "更新时间")
 
                 # 日增长值和增长值互相同步
                 if (
                     "日增长值" in df_integrated.columns
                     and "增长值" in df_integrated.columns
                 ):
-                    df_integrated["日增长值"] = df_integrated.apply(
-                        lambda row: (
-                            row["增长值"]
-                            if pd.isna(row["日增长值"]) or row["日增长值"] == ""
-                            else row["日增长值"]
-                        ),
-                        axis=1,
-                    )
-                    df_integrated["增长值"] = df_integrated.apply(
-                        lambda row: (
-                            row["日增长值"]
-                            if pd.isna(row["增长值"]) or row["增长值"] == ""
-                            else row["增长值"]
-                        ),
-                        axis=1,
-                    )
+                    _fill_blank(df_integrated, "日增长值", "增长值")
+                    _fill_blank(df_integrated, "增长值", "日增长值")
 
                 # 日增长率和增长率互相同步
                 if (
                     "日增长率" in df_integrated.columns
                     and "增长率" in df_integrated.columns
                 ):
-                    df_integrated["日增长率"] = df_integrated.apply(
-                        lambda row: (
-                            row["增长率"]
-                            if pd.isna(row["日增长率"]) or row["日增长率"] == ""
-                            else row["日增长率"]
-                        ),
-                        axis=1,
-                    )
-                    df_integrated["增长率"] = df_integrated.apply(
-                        lambda row: (
-                            row["日增长率"]
-                            if pd.isna(row["增长率"]) or row["增长率"] == ""
-                            else row["增长率"]
-                        ),
-                        axis=1,
-                    )
+                    _fill_blank(df_integrated, "日增长率", "增长率")
+                    _fill_blank(df_integrated, "增长率", "日增长率")
 
                 # 确保数据获取日期不为空
                 if "数据获取日期" in df_integrated.columns:
-                    current_date = datetime.now().strftime("%Y-%m-%d")
-                    df_integrated["数据获取日期"] = df_integrated["数据获取日期"].apply(
-                        lambda x: current_date if pd.isna(x) or x == "" else x
+                    current_date = now.strftime("%Y-%m-%d")
+                    fetch_dates = df_integrated["数据获取日期"]
+                    df_integrated["数据获取日期"] = fetch_dates.mask(
+                        _is_blank(fetch_dates), current_date
                     )
 
                 # 检查并确保所有必要列存在
@@ -1386,8 +948,11 @@ class ExcelReportGenerator:
                     if col not in df_integrated.columns
                 ]
                 if missing_columns:
-                    for column in missing_columns:
-                        df_integrated[column] = ""  # 设置默认空值
+                    # 一次reindex补齐所有缺失列（默认空值），避免逐列插入导致数据块碎片化
+                    df_integrated = df_integrated.reindex(
+                        columns=[*df_integrated.columns, *missing_columns],
+                        fill_value="",
+                    )
                     print(
                         f"已确保所有必要列存在，补充了 {len(missing_columns)} 个缺失列"
                     )
@@ -1407,34 +972,35 @@ class ExcelReportGenerator:
                 if filled_columns:
                     print(f"已确保关键列数据正常填充: {filled_columns}")
 
-                # 按基金代码排序
-                df_integrated = df_integrated.sort_values(by="基金代码")
+                # 按基金代码排序：基金代码均为6位数字时，按整数排序与按字符串排序
+                # 结果相同，转换为int64后用numpy排序，避免逐个比较Python字符串
+                fund_codes = df_integrated["基金代码"]
+                if fund_codes.str.fullmatch(r"[0-9]{6}").all():
+                    order = np.argsort(
+                        fund_codes.to_numpy(dtype=np.int64), kind="stable"
+                    )
+                    df_integrated = df_integrated.take(order)
+                else:
+                    df_integrated = df_integrated.sort_values(by="基金代码")
 
-                # 尝试加载列顺序配置
-                columns_config_path = os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)),
-                    "data",
-                    "columns_config.json",
-                )
-                if os.path.exists(columns_config_path):
+                # 应用初始化时读取的列顺序配置
+                if self._columns_order is not None:
                     try:
-                        with open(columns_config_path, "r", encoding="utf-8") as f:
-                            config = json.load(f)
-                            if "columns_order" in config:
-                                # 确保所有配置的列都存在于DataFrame中
-                                ordered_columns = []
-                                for col in config["columns_order"]:
-                                    if col in df_integrated.columns:
-                                        ordered_columns.append(col)
-                                # 添加剩余的列
-                                for col in df_integrated.columns:
-                                    if col not in ordered_columns:
-                                        ordered_columns.append(col)
-                                # 重新排序列
-                                df_integrated = df_integrated[ordered_columns]
-                                print(f"已应用保存的列顺序配置")
+                        # 配置中存在于DataFrame的列在前，剩余的列按原顺序追加
+                        existing_columns = set(df_integrated.columns)
+                        ordered_columns = dict.fromkeys(
+                            col
+                            for col in self._columns_order
+                            if col in existing_columns
+                        )
+                        ordered_columns.update(dict.fromkeys(df_integrated.columns))
+                        # 重新排序列
+                        df_integrated = df_integrated.reindex(
+                            columns=list(ordered_columns)
+                        )
+                        print(f"已应用保存的列顺序配置")
                     except Exception as e:
-                        print(f"加载列顺序配置时出错: {str(e)}")
+                        print(f"应用列顺序配置时出错: {str(e)}")
 
                 # 更新统计信息
                 stats_info["数据列总数"] = len(df_integrated.columns)
@@ -1442,14 +1008,23 @@ class ExcelReportGenerator:
                 df_integrated = pd.DataFrame()
 
             # 8. 创建ExcelWriter对象并写入数据
-            with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-                # 在写入Excel前最后一次检查并删除不需要的列
+            # 报表只写不读，使用xlsxwriter直接生成XML，不在内存中构建单元格对象树；
+            # 关闭字符串自动转换为超链接，保持与原先写出的单元格内容一致
+            with pd.ExcelWriter(
+                report_path,
+                engine="xlsxwriter",
+                engine_kwargs={"options": {"strings_to_urls": False}},
+            ) as writer:
+                # 在写入Excel前一次性过滤掉不需要的列，列顺序配置也基于过滤后的列保存
                 if not df_integrated.empty:
-                    columns_to_delete_final_excel = ["基金名称", "成交额", "成交量", "前收盘价"]
-                    for col in columns_to_delete_final_excel:
-                        if col in df_integrated.columns:
-                            df_integrated.drop(col, axis=1, inplace=True)
-                            print(f"Excel写入前: 已删除列: {col}")
+                    dropped_columns = [
+                        col
+                        for col in df_integrated.columns
+                        if col in self.EXCLUDED_COLUMNS
+                    ]
+                    if dropped_columns:
+                        df_integrated = df_integrated.drop(columns=dropped_columns)
+                        print(f"Excel写入前: 已删除列: {', '.join(dropped_columns)}")
 
                     # 写入整合后的数据到单个工作表
                     df_integrated.to_excel(
@@ -1497,33 +1072,43 @@ class ExcelReportGenerator:
                 except Exception as e:
                     print(f"添加数据说明时出错: {str(e)}")
 
-            # 保存当前列顺序配置
-            try:
-                # 在保存列顺序配置前再次检查并删除不需要的列
-                columns_to_delete_config = ["基金名称", "成交额", "成交量", "前收盘价"]
-                for col in columns_to_delete_config:
-                    if col in df_integrated.columns:
-                        df_integrated.drop(col, axis=1, inplace=True)
-                        print(f"配置保存前: 已删除列: {col}")
-
-                columns_config_path = os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)),
-                    "data",
-                    "columns_config.json",
-                )
-                os.makedirs(os.path.dirname(columns_config_path), exist_ok=True)
-                config = {"columns_order": list(df_integrated.columns)}
-                with open(columns_config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=2)
-                print(f"已保存列顺序配置: {columns_config_path}")
-            except Exception as e:
-                print(f"保存列顺序配置时出错: {str(e)}")
+            # 同时保存一份HDF5格式的整合数据，后续程序可以直接读取而无需解析Excel
+            if not df_integrated.empty:
+                try:
+                    hdf5_path = os.path.splitext(report_path)[0] + ".h5"
+                    with warnings.catch_warnings():
+                        # 混合类型的列会以pickle方式存储，忽略PyTables的性能提示
+                        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+                        df_integrated.to_hdf(
+                            hdf5_path,
+                            key="integrated_fund_data",
+                            mode="w",
+                            complevel=9,
+                            complib="blosc",
+                        )
+                    print(f"已保存整合基金数据HDF5副本: {hdf5_path}")
+                except Exception as e:
+                    print(f"保存整合基金数据HDF5副本时出错: {str(e)}")
+
+            # 保存当前列顺序配置，与已保存的配置相同时无需重写
+            columns_order = list(df_integrated.columns)
+            if columns_order != self._columns_order:
+                try:
+                    columns_config_path = self.columns_config_path
+                    os.makedirs(os.path.dirname(columns_config_path), exist_ok=True)
+                    config = {"columns_order": columns_order}
+                    with open(columns_config_path, "w", encoding="utf-8") as f:
+                        json.dump(config, f, ensure_ascii=False, indent=2)
+                    self._columns_order = columns_order
+                    print(f"已保存列顺序配置: {columns_config_path}")
+                except Exception as e:
+                    print(f"保存列顺序配置时出错: {str(e)}")
 
             print(f"量化分析报表已成功生成: {report_path}")
             return report_path
         except ImportError as e:
             print(f"缺少必要的库: {str(e)}")
-            print("请安装pandas和openpyxl库: pip install pandas openpyxl")
+            print("请安装pandas和xlsxwriter库: pip install pandas xlsxwriter")
             return None
         except Exception as e:
             print(f"生成Excel报表时发生错误: {str(e)}")
@@ -3,9 +3,7 @@ import asyncio
 import re
 import h5py
 import os
-import pandas as pd
 from datetime import datetime
-from playwright.async_api import async_playwright
 import sys
 import argparse
 
@@ -13,6 +11,49 @@ import argparse
 HDF5_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "data", "CNJY_Fund_Data.h5"
 )
+BASE_URL = "https://fund.eastmoney.com/cnjy_jzzzl.html"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+# 同时打开的页面数量上限
+MAX_CONCURRENCY = 5
+# 6位数字的基金代码，模块加载时编译一次（解析行数据和校验查询输入共用）
+_SIX_DIGITS = re.compile(r"\d{6}")
+# 解析表格只需要文档、脚本和数据请求，其余资源类型（图片、样式、字体、统计上报等）直接中止
+ALLOWED_RESOURCE_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+# 广告和统计服务的域名关键字，即使是脚本请求也一并中止
+BLOCKED_HOSTS = ("doubleclick", "googletag", "hm.baidu.com", "cnzz", "51.la")
+# 数值字段所在的单元格索引及是否为百分比：最新单位净值、最新累计净值、上个交易日单位净值、
+# 上个交易日累计净值、增长值、增长率、市价、折价率（第7至14个单元格）
+NUMERIC_CELLS = (
+    (6, False),
+    (7, False),
+    (8, False),
+    (9, False),
+    (10, False),
+    (11, True),
+    (12, False),
+    (13, True),
+)
+
+# 在浏览器中一次性提取表格数据的脚本：返回每一行所有单元格的文本，
+# 以及第4个单元格（基金代码）中链接的href，避免逐个单元格往返调用
+EXTRACT_ROWS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector))
+    .map(tr => Array.from(tr.querySelectorAll("td")))
+    .filter(tds => tds.length > 0)
+    .map(tds => {
+        const link = tds.length > 3 ? tds[3].querySelector("a") : null;
+        return {
+            cells: tds.map(td => td.textContent),
+            has_link: link !== null,
+            href: link ? link.getAttribute("href") : null,
+        };
+    })
+"""
+
+# 判断基金数据是否已渲染：页面中存在至少14个单元格的数据行
+DATA_ROW_READY_JS = """
+() => Array.from(document.querySelectorAll("tr")).some(tr => tr.cells.length >= 14)
+"""
 
 # 确保数据目录存在
 def ensure_data_directory():
@@ -36,35 +77,54 @@ def init_hdf5_file():
 def store_fund_data_to_hdf5(fund_data_list):
     init_hdf5_file()
 
-    with h5py.File(HDF5_PATH, "a") as f:
-        # 清空现有的基金数据
-        if "funds" in f:
-            del f["funds"]
-
-        # 创建基金数据组
-        funds_group = f.create_group("funds")
-
-        # 存储每只基金的数据
-        for fund_data in fund_data_list:
-            fund_code = fund_data["fund_code"]
-            if fund_code in funds_group:
-                del funds_group[fund_code]
+    # 写入临时文件后整体替换原文件：在原文件中删除再重建组时HDF5不会回收空间，文件会越来越大
+    tmp_path = HDF5_PATH + ".tmp"
+    try:
+        with h5py.File(HDF5_PATH, "r") as old_f, h5py.File(tmp_path, "w") as f:
+            # 保留原文件的元数据（创建时间、版本等）
+            for key, value in old_f.attrs.items():
+                f.attrs[key] = value
 
             # 创建基金数据组
-            fund_group = funds_group.create_group(fund_code)
+            funds_group = f.create_group("funds")
+
+            # 重复的基金代码在内存中去重（后出现的覆盖先出现的），
+            # 避免对每只基金都在HDF5中做一次存在性检查和删除
+            latest_fund_data = {}
+            for fund_data in fund_data_list:
+                latest_fund_data[fund_data["fund_code"]] = fund_data
+
+            # 存储每只基金的数据
+            for fund_code, fund_data in latest_fund_data.items():
+                # 创建基金数据组
+                fund_group = funds_group.create_group(fund_code)
+
+                # 存储基金属性
+                for key, value in fund_data.items():
+                    # 处理不同类型的数据
+                    if isinstance(value, str):
+                        # 统一将字符串编码为UTF-8，避免中文字符问题
+                        fund_group.attrs[key] = value.encode("utf-8")
+                    elif isinstance(value, float) or isinstance(value, int):
+                        fund_group.attrs[key] = value
+
+            # 更新元数据
+            f.attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.attrs["fund_count"] = len(latest_fund_data)
+    except Exception:
+        # 写入失败时删除不完整的临时文件，原文件保持不变
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-            # 存储基金属性
-            for key, value in fund_data.items():
-                # 处理不同类型的数据
-                if isinstance(value, str):
-                    # 统一将字符串编码为UTF-8，避免中文字符问题
-                    fund_group.attrs[key] = value.encode("utf-8")
-                elif isinstance(value, float) or isinstance(value, int):
-                    fund_group.attrs[key] = value
-
-        # 更新元数据
-        f.attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.attrs["fund_count"] = len(fund_data_list)
+    try:
+        os.replace(tmp_path, HDF5_PATH)
+    except PermissionError as e:
+        # Windows下原文件正被其他程序打开时无法替换，保留临时文件中的新数据并提示
+        print(f"无法替换HDF5文件（可能正被其他程序打开）: {e}")
+        print(f"本次数据已保存在 {tmp_path}，关闭占用文件的程序后可将其重命名为 {HDF5_PATH}")
+        return False
+    return True
 
 # 获取所有基金代码
 def get_all_fund_codes():
@@ -100,38 +160,128 @@ def query_fund_by_code(fund_code):
 
         return fund_data
 
-# 解析百分比数据
-def parse_percentage_data(text):
-    if text == "---" or not text or text == "-" or text.strip() == "":
-        return "---"
-    try:
-        # 去除百分号并转换为浮点数
-        if text.endswith("%"):
-            return float(text[:-1])
-        else:
-            return float(text)
-    except:
-        return "---"
-
-# 解析数值数据
-def parse_numeric_data(text):
-    if text == "---" or not text or text == "-" or text.strip() == "":
-        return "---"
-    try:
-        return float(text)
-    except:
-        return "---"
+# 按列整体解析数值数据（percentage为True时先去除末尾的百分号），
+# 无法解析的值（包括"---"、"-"和空白）统一返回"---"
+def parse_numeric_column(texts, percentage=False):
+    # pandas只在解析抓取结果时需要，延迟导入以加快查询菜单的启动
+    import pandas as pd
+
+    series = pd.Series(texts, dtype=object).str.strip()
+    if percentage:
+        series = series.str.replace(r"%$", "", regex=True)
+    values = pd.to_numeric(series, errors="coerce").astype(float)
+    parsed = values.astype(object).where(values.notna(), "---").tolist()
+    # pd.to_numeric不认识但float()能解析的写法（如"1_000"、"nan"）逐个回退到float()
+    for index in values.index[values.isna()]:
+        try:
+            parsed[index] = float(series[index])
+        except ValueError:
+            pass
+    return parsed
+
+# 拦截请求：中止不需要的资源类型和广告统计域名的请求，其余请求正常放行
+async def block_unneeded_requests(route):
+    request = route.request
+    if request.resource_type not in ALLOWED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# 抓取单个页面的表格行数据，通过信号量限制同时打开的页面数量
+async def fetch_page_rows(context, url, semaphore):
+    async with semaphore:
+        page = await context.new_page()
+        try:
+            print(f"正在处理页面，URL: {url}")
+
+            # 导航到目标页面：DOM解析完成即返回，不再等待网络空闲（页面的统计请求会持续很久）
+            await page.goto(url, wait_until="domcontentloaded")
+
+            # 只等待真正需要的基金数据行，超时则交给下面的表格选择器继续尝试
+            try:
+                await page.wait_for_function(DATA_ROW_READY_JS, timeout=15000)
+            except Exception:
+                pass
+
+            # 等待表格加载完成
+            try:
+                # 尝试多种可能的表格选择器
+                table_selectors = [
+                    "table > tbody > tr",  # 原始选择器
+                    ".dataList > tbody > tr",  # 可能的类名选择器
+                    "#dbtable > tbody > tr",  # 可能的ID选择器
+                    "table.dataList > tbody > tr"  # 更具体的选择器
+                ]
+                
+                found_table = False
+                for selector in table_selectors:
+                    try:
+                        await page.wait_for_selector(selector, timeout=5000)
+                        print(f"使用选择器 '{selector}' 成功找到基金数据表格")
+                        found_table = True
+                        break
+                    except:
+                        continue
+                
+                if not found_table:
+                    # 作为最后的尝试，统计tr元素数量（只取计数，不为每个元素创建句柄）
+                    tr_count = await page.locator("tr").count()
+                    if tr_count > 5:  # 如果找到了多个tr元素，假设表格存在
+                        print("找到多个tr元素，假设表格存在")
+                        found_table = True
+                    else:
+                        print("未找到基金数据表格，可能页面结构已更改")
+                        # 使用return而不是break
+                        return []
+            except Exception as e:
+                print(f"查找表格时出错: {e}")
+                # 使用return而不是break
+                return []
+
+            # 获取所有行数据
+            rows = []
+            # 尝试多种可能的行选择器
+            row_selectors = [
+                "table > tbody > tr",  # 原始选择器
+                ".dataList > tbody > tr",  # 可能的类名选择器
+                "#dbtable > tbody > tr",  # 可能的ID选择器
+                "table.dataList > tbody > tr",  # 更具体的选择器
+                "tr"  # 最后的备选，获取所有tr元素
+            ]
+            
+            for selector in row_selectors:
+                try:
+                    # 一次evaluate取回所有行的单元格文本（已过滤掉没有td的表头行）
+                    rows = await page.evaluate(EXTRACT_ROWS_JS, selector)
+                    if len(rows) > 0:
+                        print(f"使用选择器 '{selector}' 定位到 {len(rows)} 条基金数据行")
+                        break
+                except:
+                    continue
+
+            return rows
+
+        except Exception as e:
+            print(f"爬虫过程中发生错误: {e}")
+            return []
+
+        finally:
+            await page.close()
 
 # 使用Playwright获取场内交易基金数据
-async def fetch_cnjy_fund_data():
+async def fetch_cnjy_fund_data(urls=None):
     fund_data_list = []
+    # 默认直接处理当前页面，不需要分页；传入多个URL（如分页地址）时并发抓取
+    if urls is None:
+        urls = [BASE_URL]
     try:
-        # 设置初始页面
-        page_num = 1
-        total_pages = 1  # 初始值，后续会从网页中获取实际值
+        # Playwright只在抓取时需要，延迟导入以加快查询菜单的启动
+        from playwright.async_api import async_playwright
+
         total_processed = 0
-        base_url = "https://fund.eastmoney.com/cnjy_jzzzl.html"
-        
+
         # 使用Playwright启动浏览器
         async with async_playwright() as p:
             print("正在启动浏览器...")
@@ -147,226 +297,134 @@ async def fetch_cnjy_fund_data():
                 ],
             )
 
-            # 在创建页面时设置user agent
-            page = await browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            )
-
-            # 设置页面加载超时
-            page.set_default_timeout(60000)  # 60秒
-
             try:
-                # 直接处理当前页面，不需要分页
-                current_url = base_url
-                print(f"正在处理页面，URL: {current_url}")
+                # 所有页面共用一个浏览器上下文（设置user agent，复用cookie和缓存）
+                context = await browser.new_context(user_agent=USER_AGENT)
 
-                # 导航到目标页面
-                await page.goto(current_url)
-                await page.wait_for_load_state("networkidle")  # 等待网络空闲
+                # 设置页面加载超时
+                context.set_default_timeout(60000)  # 60秒
 
-                # 等待表格加载完成
-                try:
-                    # 尝试多种可能的表格选择器
-                    table_selectors = [
-                        "table > tbody > tr",  # 原始选择器
-                        ".dataList > tbody > tr",  # 可能的类名选择器
-                        "#dbtable > tbody > tr",  # 可能的ID选择器
-                        "table.dataList > tbody > tr"  # 更具体的选择器
-                    ]
-                    
-                    found_table = False
-                    for selector in table_selectors:
-                        try:
-                            await page.wait_for_selector(selector, timeout=5000)
-                            print(f"使用选择器 '{selector}' 成功找到基金数据表格")
-                            found_table = True
-                            break
-                        except:
-                            continue
-                    
-                    if not found_table:
-                        # 作为最后的尝试，获取所有tr元素
-                        all_trs = await page.query_selector_all("tr")
-                        if len(all_trs) > 5:  # 如果找到了多个tr元素，假设表格存在
-                            print("找到多个tr元素，假设表格存在")
-                            found_table = True
-                        else:
-                            print("未找到基金数据表格，可能页面结构已更改")
-                            # 使用return而不是break
-                            return []
-                except Exception as e:
-                    print(f"查找表格时出错: {e}")
-                    # 使用return而不是break
-                    return []
-
-                # 获取所有行数据
-                rows = []
-                # 尝试多种可能的行选择器
-                row_selectors = [
-                    "table > tbody > tr",  # 原始选择器
-                    ".dataList > tbody > tr",  # 可能的类名选择器
-                    "#dbtable > tbody > tr",  # 可能的ID选择器
-                    "table.dataList > tbody > tr",  # 更具体的选择器
-                    "tr"  # 最后的备选，获取所有tr元素
-                ]
-                
-                for selector in row_selectors:
-                    try:
-                        rows = await page.query_selector_all(selector)
-                        # 过滤掉可能的表头行
-                        rows = [row for row in rows if len(await row.query_selector_all("td")) > 0]
-                        if len(rows) > 0:
-                            print(f"使用选择器 '{selector}' 定位到 {len(rows)} 条基金数据行")
-                            break
-                    except:
-                        continue
-                
-                if len(rows) == 0:
-                    print("未找到有效的基金数据行")
-                    # 使用return而不是break
-                    return []
+                # 在上下文级别拦截不需要的资源，对所有页面生效
+                await context.route("**/*", block_unneeded_requests)
 
-                processed_rows = 0
+                semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+                page_rows_list = await asyncio.gather(
+                    *[fetch_page_rows(context, url, semaphore) for url in urls]
+                )
 
-                # 处理每行数据
-                for row in rows:
-                    try:
-                        # 获取所有单元格
-                        cells = await row.query_selector_all("td")
+            finally:
+                # 关闭浏览器
+                await browser.close()
 
-                        if len(cells) < 14:  # 确保有足够的字段（14个单元格）
-                            continue
+        # 按URL顺序合并各页面的行数据
+        rows = [row for page_rows in page_rows_list for row in page_rows]
+        if len(rows) == 0:
+            print("未找到有效的基金数据行")
+            return []
 
-                        # 从第4个单元格开始提取数据（索引为3），提取到第14个单元格（索引为13）
-                        # 字段顺序：基金代码、基金简称、基金类型、最新单位净值、最新累计净值、上个交易日单位净值、上个交易日累计净值、增长值、增长率、市价、折价率
-                        
-                        # 初始化所有字段为默认值
-                        fund_code = "---"
-                        fund_name = "---"
-                        fund_type = "---"
-                        latest_unit_nav = "---"  # 最新单位净值
-                        latest_accum_nav = "---"  # 最新累计净值
-                        prev_unit_nav = "---"  # 上个交易日单位净值
-                        prev_accum_nav = "---"  # 上个交易日累计净值
-                        growth_value = "---"  # 增长值
-                        growth_rate = "---"  # 增长率
-                        market_price = "---"  # 市价
-                        discount_rate = "---"  # 折价率
-
-                        # 安全地提取字段数据
-                        try:
-                            # 基金代码（第4个单元格，索引3）
-                            fund_code_text = await cells[3].text_content()
-                            fund_code_text = fund_code_text.strip()
-                            # 检查是否是6位数字的基金代码格式
-                            fund_code_match = re.search(r"\d{6}", fund_code_text)
-                            if fund_code_match:
-                                fund_code = fund_code_match.group(0)
-                            else:
-                                # 尝试从链接中提取基金代码
-                                fund_link = await cells[3].query_selector("a")
-                                if fund_link:
-                                    href = await fund_link.get_attribute("href")
-                                    fund_code_match = re.search(r"\d{6}", href)
-                                    if fund_code_match:
-                                        fund_code = fund_code_match.group(0)
-                                
-                                # 如果仍未获取到有效代码，直接使用文本（可能包含非数字）
-                                if fund_code == "---" and fund_code_text:
-                                    fund_code = fund_code_text
-
-                            # 基金简称（第5个单元格，索引4）
-                            fund_name_text = await cells[4].text_content()
-                            fund_name = fund_name_text.strip() if fund_name_text.strip() else "---"
-
-                            # 基金类型（第6个单元格，索引5）
-                            fund_type_text = await cells[5].text_content()
-                            fund_type = fund_type_text.strip() if fund_type_text.strip() else "---"
-
-                            # 最新单位净值（第7个单元格，索引6）
-                            latest_unit_nav_text = await cells[6].text_content()
-                            latest_unit_nav = parse_numeric_data(latest_unit_nav_text.strip())
-
-                            # 最新累计净值（第8个单元格，索引7）
-                            latest_accum_nav_text = await cells[7].text_content()
-                            latest_accum_nav = parse_numeric_data(latest_accum_nav_text.strip())
-
-                            # 上个交易日单位净值（第9个单元格，索引8）
-                            prev_unit_nav_text = await cells[8].text_content()
-                            prev_unit_nav = parse_numeric_data(prev_unit_nav_text.strip())
-
-                            # 上个交易日累计净值（第10个单元格，索引9）
-                            prev_accum_nav_text = await cells[9].text_content()
-                            prev_accum_nav = parse_numeric_data(prev_accum_nav_text.strip())
-
-                            # 增长值（第11个单元格，索引10）
-                            growth_value_text = await cells[10].text_content()
-                            growth_value = parse_numeric_data(growth_value_text.strip())
-
-                            # 增长率（第12个单元格，索引11）
-                            growth_rate_text = await cells[11].text_content()
-                            growth_rate = parse_percentage_data(growth_rate_text.strip())
-
-                            # 市价（第13个单元格，索引12）
-                            market_price_text = await cells[12].text_content()
-                            market_price = parse_numeric_data(market_price_text.strip())
-
-                            # 折价率（第14个单元格，索引13）
-                            discount_rate_text = await cells[13].text_content()
-                            discount_rate = parse_percentage_data(discount_rate_text.strip())
-
-                        except Exception:
-                            continue
-
-                        # 构建基金数据字典，严格按照指定顺序映射
-                        # 字段顺序：
-                        # 1. fund_code (基金代码)
-                        # 2. fund_name (基金简称)
-                        # 3. fund_type (基金类型)
-                        # 4. latest_unit_nav (最新单位净值)
-                        # 5. latest_accum_nav (最新累计净值)
-                        # 6. prev_unit_nav (上个交易日单位净值)
-                        # 7. prev_accum_nav (上个交易日累计净值)
-                        # 8. growth_value (增长值)
-                        # 9. growth_rate (增长率)
-                        # 10. market_price (市价)
-                        # 11. discount_rate (折价率)
-                        fund_data = {
-                            "fund_code": fund_code,
-                            "fund_name": fund_name,
-                            "fund_type": fund_type,
-                            "latest_unit_nav": latest_unit_nav,
-                            "latest_accum_nav": latest_accum_nav,
-                            "prev_unit_nav": prev_unit_nav,
-                            "prev_accum_nav": prev_accum_nav,
-                            "growth_value": growth_value,
-                            "growth_rate": growth_rate,
-                            "market_price": market_price,
-                            "discount_rate": discount_rate,
-                            "fetch_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-
-                        # 添加到基金数据列表
-                        fund_data_list.append(fund_data)
-                        processed_rows += 1
-                        total_processed += 1
-
-                        # 每处理100条记录显示一次进度
-                        if total_processed % 100 == 0:
-                            print(f"已处理 {total_processed} 条基金数据")
-
-                    except Exception:
-                        continue
+        # 确保有足够的字段（14个单元格），数值字段再按列整体解析
+        rows = [row for row in rows if len(row["cells"]) >= 14]
+        numeric_rows = list(zip(*(
+            parse_numeric_column([row["cells"][index] for row in rows], percentage)
+            for index, percentage in NUMERIC_CELLS
+        )))
 
-                print(f"页面处理完成，共处理 {processed_rows} 条记录")
-                print("数据提取完成")
+        processed_rows = 0
+        # 所有行共用同一个数据获取时间，只格式化一次
+        fetch_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            except Exception as e:
-                print(f"爬虫过程中发生错误: {e}")
+        # 处理每行数据
+        for row, numeric_row in zip(rows, numeric_rows):
+            try:
+                # 获取所有单元格的文本
+                cells = row["cells"]
 
-            finally:
-                # 关闭浏览器
-                await browser.close()
+                # 从第4个单元格开始提取数据（索引为3），提取到第14个单元格（索引为13）
+                # 字段顺序：基金代码、基金简称、基金类型、最新单位净值、最新累计净值、上个交易日单位净值、上个交易日累计净值、增长值、增长率、市价、折价率
+                
+                # 初始化所有字段为默认值
+                fund_code = "---"
+                fund_name = "---"
+                fund_type = "---"
+
+                # 安全地提取字段数据
+                try:
+                    # 基金代码、基金简称、基金类型（第4至6个单元格，索引3-5），各去除一次首尾空白
+                    fund_code_text, fund_name_text, fund_type_text = (
+                        text.strip() for text in cells[3:6]
+                    )
+
+                    # 基金代码
+                    # 检查是否是6位数字的基金代码格式
+                    fund_code_match = _SIX_DIGITS.search(fund_code_text)
+                    if fund_code_match:
+                        fund_code = fund_code_match.group(0)
+                    else:
+                        # 尝试从链接中提取基金代码
+                        if row["has_link"]:
+                            href = row["href"]
+                            fund_code_match = _SIX_DIGITS.search(href)
+                            if fund_code_match:
+                                fund_code = fund_code_match.group(0)
+                        
+                        # 如果仍未获取到有效代码，直接使用文本（可能包含非数字）
+                        if fund_code == "---" and fund_code_text:
+                            fund_code = fund_code_text
+
+                    # 基金简称、基金类型
+                    fund_name = fund_name_text or "---"
+                    fund_type = fund_type_text or "---"
+
+                    # 最新单位净值、最新累计净值、上个交易日单位净值、上个交易日累计净值、
+                    # 增长值、增长率、市价、折价率（第7至14个单元格，已按列解析）
+                    (latest_unit_nav, latest_accum_nav, prev_unit_nav, prev_accum_nav,
+                     growth_value, growth_rate, market_price, discount_rate) = numeric_row
+
+                except Exception:
+                    continue
+
+                # 构建基金数据字典，严格按照指定顺序映射
+                # 字段顺序：
+                # 1. fund_code (基金代码)
+                # 2. fund_name (基金简称)
+                # 3. fund_type (基金类型)
+                # 4. latest_unit_nav (最新单位净值)
+                # 5. latest_accum_nav (最新累计净值)
+                # 6. prev_unit_nav (上个交易日单位净值)
+                # 7. prev_accum_nav (上个交易日累计净值)
+                # 8. growth_value (增长值)
+                # 9. growth_rate (增长率)
+                # 10. market_price (市价)
+                # 11. discount_rate (折价率)
+                fund_data = {
+                    "fund_code": fund_code,
+                    "fund_name": fund_name,
+                    "fund_type": fund_type,
+                    "latest_unit_nav": latest_unit_nav,
+                    "latest_accum_nav": latest_accum_nav,
+                    "prev_unit_nav": prev_unit_nav,
+                    "prev_accum_nav": prev_accum_nav,
+                    "growth_value": growth_value,
+                    "growth_rate": growth_rate,
+                    "market_price": market_price,
+                    "discount_rate": discount_rate,
+                    "fetch_time": fetch_time
+                }
+
+                # 添加到基金数据列表
+                fund_data_list.append(fund_data)
+                processed_rows += 1
+                total_processed += 1
+
+                # 每处理100条记录显示一次进度
+                if total_processed % 100 == 0:
+                    print(f"已处理 {total_processed} 条基金数据")
+
+            except Exception:
+                continue
+
+        print(f"页面处理完成，共处理 {processed_rows} 条记录")
+        print("数据提取完成")
 
     except Exception as e:
         print(f"程序执行出错: {e}")
@@ -384,8 +442,8 @@ def download_all_cnjy_funds():
         # 存储到HDF5文件
         if fund_data_list:
             print(f"将 {len(fund_data_list)} 条基金数据存储到HDF5文件...")
-            store_fund_data_to_hdf5(fund_data_list)
-            print("数据存储完成！")
+            if store_fund_data_to_hdf5(fund_data_list):
+                print("数据存储完成！")
         else:
             print("未获取到基金数据，无法存储")
     except Exception as e:
@@ -396,7 +454,7 @@ def query_cnjy_fund():
     fund_code = input("请输入场内交易基金代码: ").strip()
     
     # 验证基金代码格式（6位数字）
-    if not re.match(r"^\d{6}$", fund_code):
+    if not _SIX_DIGITS.fullmatch(fund_code):
         print("错误：基金代码格式不正确，请输入6位数字的基金代码")
         return
     
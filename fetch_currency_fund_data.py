@@ -6,15 +6,52 @@ import h5py
 import os
 import sys
 import argparse
-import pandas as pd
 from datetime import datetime
-from playwright.async_api import async_playwright
 
 # 全局配置
 HDF5_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "data", "Currency_Fund_Data.h5"
 )
 URL = "http://fund.eastmoney.com/HBJJ_dwsy.html"
+# 解析表格只需要文档、脚本和数据请求，其余资源类型（图片、样式、字体、统计上报等）直接中止
+ALLOWED_RESOURCE_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+# 广告和统计服务的域名关键字，即使是脚本请求也一并中止
+BLOCKED_HOSTS = ("doubleclick", "googletag", "hm.baidu.com", "cnzz", "51.la")
+
+# 6位数字的基金代码，用于校验查询输入
+_SIX_DIGITS = re.compile(r"\d{6}")
+
+# 解析表格HTML用的正则表达式，在模块加载时编译一次，避免每行重复查找编译缓存
+# 表头中的数据日期
+_DATE_HEADER_RE = re.compile(r"<nobr>(\d{4}-\d{2}-\d{2})</nobr>")
+# 基金数据行
+_FUND_ROW_RE = re.compile(
+    r'<tr height="20" bgcolor="(?:#F5FFFF|#FFFFFF)"[^>]*>(.*?)</tr>'
+)
+# 基金代码
+_FUND_CODE_RE = re.compile(r"<td>(\d{6})</td>")
+# 基金名称（带链接和空链接两种形式）
+_FUND_NAME_RE = re.compile(
+    r'<td class="jc"><nobr><a href="http://fund\.eastmoney\.com/\d+\.html">([^<]+)</a>'
+)
+_FUND_NAME_FALLBACK_RE = re.compile(r'<td class="jc"><nobr><a href=""[^>]*>([^<]+)</a>')
+# 最新万份收益（两种可能的位置）
+_LATEST_YIELD_RE = re.compile(
+    r'<td bgcolor="#EBF3FB"><span class="ping">([\d.]+)</span></td>'
+)
+_LATEST_YIELD_FALLBACK_RE = re.compile(r'<span class="ping">([\d.]+)</span>')
+# 最新7日年化（两种可能的位置）
+_LATEST_ANNUAL_RE = re.compile(r"<td>([\d.]+)%</td>")
+_LATEST_ANNUAL_FALLBACK_RE = re.compile(r'<td bgcolor="#EBF3FB">([\d.]+)%</td>')
+# 成立日期
+_ESTABLISH_DATE_RE = re.compile(r"<td>(\d{4}-\d{2}-\d{2})</td>")
+# 基金经理（带链接和空链接两种形式）
+_MANAGER_RE = re.compile(
+    r'<td><a href="http://fundf10\.eastmoney\.com/jjjl_\d+\.html">([^<]+)</a></td>'
+)
+_MANAGER_FALLBACK_RE = re.compile(r'<td><a href=""[^>]*>([^<]+)</a></td>')
+# 手续费
+_FEE_RE = re.compile(r'<span class="red">(\d+)</span>')
 
 
 # 确保数据目录存在
@@ -41,35 +78,56 @@ def init_hdf5_file():
 def store_fund_data_to_hdf5(fund_data_list):
     init_hdf5_file()
 
-    with h5py.File(HDF5_PATH, "a") as f:
-        # 清空现有的基金数据
-        if "funds" in f:
-            del f["funds"]
-
-        # 创建基金数据组
-        funds_group = f.create_group("funds")
-
-        # 存储每只基金的数据
-        for fund_data in fund_data_list:
-            fund_code = fund_data["fund_code"]
-            if fund_code in funds_group:
-                del funds_group[fund_code]
+    # 写入临时文件后整体替换原文件：在原文件中删除再重建组时HDF5不会回收空间，文件会越来越大
+    tmp_path = HDF5_PATH + ".tmp"
+    try:
+        with h5py.File(HDF5_PATH, "r") as old_f, h5py.File(tmp_path, "w") as f:
+            # 保留原文件的元数据（创建时间、版本等）
+            for key, value in old_f.attrs.items():
+                f.attrs[key] = value
 
             # 创建基金数据组
-            fund_group = funds_group.create_group(fund_code)
+            funds_group = f.create_group("funds")
+
+            # 重复的基金代码在内存中去重（后出现的覆盖先出现的），
+            # 避免对每只基金都在HDF5中做一次存在性检查和删除
+            latest_fund_data = {}
+            for fund_data in fund_data_list:
+                latest_fund_data[fund_data["fund_code"]] = fund_data
+
+            # 存储每只基金的数据
+            for fund_code, fund_data in latest_fund_data.items():
+                # 创建基金数据组
+                fund_group = funds_group.create_group(fund_code)
+
+                # 存储基金属性
+                for key, value in fund_data.items():
+                    # 处理不同类型的数据
+                    if isinstance(value, str):
+                        # 统一将字符串编码为UTF-8，避免中文字符问题
+                        fund_group.attrs[key] = value.encode("utf-8")
+                    elif isinstance(value, float) or isinstance(value, int):
+                        fund_group.attrs[key] = value
+
+            # 更新元数据
+            f.attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.attrs["fund_count"] = len(latest_fund_data)
+    except Exception:
+        # 写入失败时删除不完整的临时文件，原文件保持不变
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-            # 存储基金属性
-            for key, value in fund_data.items():
-                # 处理不同类型的数据
-                if isinstance(value, str):
-                    # 统一将字符串编码为UTF-8，避免中文字符问题
-                    fund_group.attrs[key] = value.encode("utf-8")
-                elif isinstance(value, float) or isinstance(value, int):
-                    fund_group.attrs[key] = value
-
-        # 更新元数据
-        f.attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.attrs["fund_count"] = len(fund_data_list)
+    try:
+        os.replace(tmp_path, HDF5_PATH)
+    except PermissionError as e:
+        # Windows下原文件正被其他程序打开时无法替换，保留临时文件中的新数据并提示
+        print(f"无法替换HDF5文件（可能正被其他程序打开）: {e}")
+        print(
+            f"本次数据已保存在 {tmp_path}，关闭占用文件的程序后可将其重命名为 {HDF5_PATH}"
+        )
+        return False
+    return True
 
 
 # 查询基金数据
@@ -108,11 +166,25 @@ def get_all_fund_codes():
         return list(f["funds"].keys())
 
 
+# 拦截请求：中止不需要的资源类型和广告统计域名的请求，其余请求正常放行
+async def block_unneeded_requests(route):
+    request = route.request
+    if request.resource_type not in ALLOWED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 # 使用Playwright获取货币基金数据
 async def fetch_currency_fund_data():
     fund_data_list = []
 
     try:
+        # Playwright只在抓取时需要，延迟导入以加快查询菜单的启动
+        from playwright.async_api import async_playwright
+
         async with async_playwright() as p:
             browser = await p.chromium.launch(
                 headless=True,  # 无头模式，可以改为False查看浏览器操作
@@ -120,19 +192,20 @@ async def fetch_currency_fund_data():
             )
 
             page = await browser.new_page()
+            await page.route("**/*", block_unneeded_requests)
 
-            # 导航到目标网页
-            await page.goto(URL, wait_until="networkidle")
+            # 导航到目标网页：DOM解析完成即返回，不再等待网络空闲（页面的统计请求会持续很久）
+            await page.goto(URL, wait_until="domcontentloaded")
 
-            # 等待表格加载完成
-            await page.wait_for_selector("table.dbtable#oTable")
+            # 等待表格中的基金数据行加载完成
+            await page.wait_for_selector('table.dbtable#oTable tr[height="20"]')
 
             # 提取表格内容
             table_html = await page.inner_html("table.dbtable#oTable")
 
             # 使用正则表达式解析表格内容
             # 首先获取表头，确定日期
-            date_match = re.search(r"<nobr>(\d{4}-\d{2}-\d{2})</nobr>", table_html)
+            date_match = _DATE_HEADER_RE.search(table_html)
             latest_date = (
                 date_match.group(1)
                 if date_match
@@ -140,10 +213,9 @@ async def fetch_currency_fund_data():
             )
 
             # 解析每一行基金数据
-            fund_rows = re.findall(
-                r'<tr height="20" bgcolor="(?:#F5FFFF|#FFFFFF)"[^>]*>(.*?)</tr>',
-                table_html,
-            )
+            fund_rows = _FUND_ROW_RE.findall(table_html)
+            # 所有行共用同一个数据获取时间，只格式化一次
+            fetch_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             print(f"找到 {len(fund_rows)} 行基金数据")
             # 只打印前几行用于调试
@@ -153,64 +225,47 @@ async def fetch_currency_fund_data():
                     print(row)
                     print("-" * 50)
                 # 提取基金代码
-                fund_code_match = re.search(r"<td>(\d{6})</td>", row)
+                fund_code_match = _FUND_CODE_RE.search(row)
                 if not fund_code_match:
                     continue
                 fund_code = fund_code_match.group(1)
 
                 # 提取基金名称 - 根据实际HTML结构调整
-                fund_name_match = re.search(
-                    r'<td class="jc"><nobr><a href="http://fund\.eastmoney\.com/\d+\.html">([^<]+)</a>',
-                    row,
-                )
+                fund_name_match = _FUND_NAME_RE.search(row)
                 if not fund_name_match:
-                    fund_name_match = re.search(
-                        r'<td class="jc"><nobr><a href=""[^>]*>([^<]+)</a>', row
-                    )
+                    fund_name_match = _FUND_NAME_FALLBACK_RE.search(row)
                 fund_name = fund_name_match.group(1) if fund_name_match else ""
 
                 # 提取最新万份收益 - 处理两种可能的位置
-                latest_yield_match = re.search(
-                    r'<td bgcolor="#EBF3FB"><span class="ping">([\d.]+)</span></td>',
-                    row,
-                )
+                latest_yield_match = _LATEST_YIELD_RE.search(row)
                 if not latest_yield_match:
-                    latest_yield_match = re.search(
-                        r'<span class="ping">([\d.]+)</span>', row
-                    )
+                    latest_yield_match = _LATEST_YIELD_FALLBACK_RE.search(row)
                 latest_yield = (
                     float(latest_yield_match.group(1)) if latest_yield_match else 0.0
                 )
 
                 # 提取最新7日年化 - 处理两种可能的位置
-                latest_annual_match = re.search(r"<td>([\d.]+)%</td>", row)
+                latest_annual_match = _LATEST_ANNUAL_RE.search(row)
                 if not latest_annual_match:
-                    latest_annual_match = re.search(
-                        r'<td bgcolor="#EBF3FB">([\d.]+)%</td>', row
-                    )
+                    latest_annual_match = _LATEST_ANNUAL_FALLBACK_RE.search(row)
                 latest_annual = (
                     float(latest_annual_match.group(1)) if latest_annual_match else 0.0
                 )
 
                 # 提取成立日期
-                establish_date_match = re.search(r"<td>(\d{4}-\d{2}-\d{2})</td>", row)
+                establish_date_match = _ESTABLISH_DATE_RE.search(row)
                 establish_date = (
                     establish_date_match.group(1) if establish_date_match else ""
                 )
 
                 # 提取基金经理 - 根据实际HTML结构调整
-                manager_match = re.search(
-                    r'<td><a href="http://fundf10\.eastmoney\.com/jjjl_\d+\.html">([^<]+)</a></td>',
-                    row,
-                )
+                manager_match = _MANAGER_RE.search(row)
                 if not manager_match:
-                    manager_match = re.search(
-                        r'<td><a href=""[^>]*>([^<]+)</a></td>', row
-                    )
+                    manager_match = _MANAGER_FALLBACK_RE.search(row)
                 manager = manager_match.group(1) if manager_match else ""
 
                 # 提取手续费
-                fee_match = re.search(r'<span class="red">(\d+)</span>', row)
+                fee_match = _FEE_RE.search(row)
                 fee = float(fee_match.group(1)) if fee_match else 0.0
 
                 # 创建基金数据字典
@@ -223,7 +278,7 @@ async def fetch_currency_fund_data():
                     "manager": manager,
                     "fee": fee,
                     "update_date": latest_date,
-                    "fetch_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "fetch_time": fetch_time,
                 }
 
                 fund_data_list.append(fund_data)
@@ -247,8 +302,8 @@ def download_all_currency_funds():
         print(f"成功获取 {len(fund_data_list)} 只货币基金数据")
 
         # 存储数据到HDF5文件
-        store_fund_data_to_hdf5(fund_data_list)
-        print(f"数据已成功保存到 {HDF5_PATH}")
+        if store_fund_data_to_hdf5(fund_data_list):
+            print(f"数据已成功保存到 {HDF5_PATH}")
     else:
         print("未获取到任何货币基金数据")
 
@@ -258,7 +313,7 @@ def query_currency_fund():
     fund_code = input("请输入货币基金代码: ").strip()
     
     # 验证基金代码格式（6位数字）
-    if not re.match(r"^\d{6}$", fund_code):
+    if not _SIX_DIGITS.fullmatch(fund_code):
         print("错误：基金代码格式不正确，请输入6位数字的基金代码")
         return
     
@@ -6,16 +6,62 @@ import os
 import sys
 import argparse
 import pandas as pd
-import json
-import logging
-import traceback
-from datetime import datetime, timedelta
+from datetime import datetime
 from playwright.async_api import async_playwright
 
 # 全局配置
 HDF5_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "data", "FBS_Fund_Ranking_Data.h5"
 )
+BASE_URL = "https://fund.eastmoney.com/data/fbsfundranking.html"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+# 同时打开的标签页数量上限
+MAX_CONCURRENCY = 5
+# 是否输出逐行的调试信息（每页上千行，逐行打印会明显拖慢抓取）
+DEBUG = False
+# 6位数字的基金代码，模块加载时编译一次（解析行数据和校验查询输入共用）
+_SIX_DIGITS = re.compile(r"\d{6}")
+# 分页控件中的总页数（"当前页/总页数"中斜杠后的数字）
+_PAGINATION_RE = re.compile(r"/\s*(\d+)")
+# 解析表格只需要文档、脚本和数据请求，其余资源类型（图片、样式、字体、统计上报等）直接中止
+ALLOWED_RESOURCE_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+# 广告和统计服务的域名关键字，即使是脚本请求也一并中止
+BLOCKED_HOSTS = ("doubleclick", "googletag", "hm.baidu.com", "cnzz", "51.la")
+# 数值字段所在的单元格索引及是否为百分比：最新单位净值、最新累计净值、近1周、近1月、近3月、
+# 近6月、近1年、近2年、近3年、今年来、成立来增长率（第7至17个单元格）
+NUMERIC_CELLS = (
+    (6, False),
+    (7, False),
+    (8, True),
+    (9, True),
+    (10, True),
+    (11, True),
+    (12, True),
+    (13, True),
+    (14, True),
+    (15, True),
+    (16, True),
+)
+
+# 判断基金数据是否已加载：数据表格中存在至少18个单元格的行
+DATA_ROW_READY_JS = """
+() => Array.from(document.querySelectorAll("#dbtable > tbody > tr"))
+    .some(tr => tr.cells.length >= 18)
+"""
+
+# 在浏览器中一次性提取表格数据的脚本：返回每一行所有单元格的文本，
+# 以及第3个单元格（基金代码）中链接的href，避免逐个单元格往返调用
+EXTRACT_ROWS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map(tr => {
+    const tds = Array.from(tr.querySelectorAll("td"));
+    const link = tds.length > 2 ? tds[2].querySelector("a") : null;
+    return {
+        cells: tds.map(td => td.textContent),
+        has_link: link !== null,
+        href: link ? link.getAttribute("href") : null,
+    };
+})
+"""
 
 
 # 确保数据目录存在
@@ -40,9 +86,15 @@ def init_hdf5_file():
 
 # 存储基金数据到HDF5文件
 def store_fund_data_to_hdf5(fund_data_list):
-    init_hdf5_file()
+    ensure_data_directory()
 
+    # 整个写入过程只打开一次文件（文件不存在时由"a"模式创建）
     with h5py.File(HDF5_PATH, "a") as f:
+        # 新建的文件补充写入元数据
+        if "created_at" not in f.attrs:
+            f.attrs["created_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.attrs["version"] = "1.0"
+
         # 清空现有的基金数据
         if "funds" in f:
             del f["funds"]
@@ -50,12 +102,14 @@ def store_fund_data_to_hdf5(fund_data_list):
         # 创建基金数据组
         funds_group = f.create_group("funds")
 
-        # 存储每只基金的数据
+        # 重复的基金代码在内存中去重（后出现的覆盖先出现的），
+        # funds组是刚新建的，无需再对每只基金做存在性检查和删除
+        latest_fund_data = {}
         for fund_data in fund_data_list:
-            fund_code = fund_data["fund_code"]
-            if fund_code in funds_group:
-                del funds_group[fund_code]
+            latest_fund_data[fund_data["fund_code"]] = fund_data
 
+        # 存储每只基金的数据
+        for fund_code, fund_data in latest_fund_data.items():
             # 创建基金数据组
             fund_group = funds_group.create_group(fund_code)
 
@@ -78,7 +132,7 @@ def store_fund_data_to_hdf5(fund_data_list):
 
         # 更新元数据
         f.attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.attrs["fund_count"] = len(fund_data_list)
+        f.attrs["fund_count"] = len(latest_fund_data)
 
 
 # 查询基金数据
@@ -120,41 +174,234 @@ def query_fund_by_code(fund_code):
         return fund_data
 
 
-# 解析百分比数据
-def parse_percentage_data(text):
-    if text == "---" or not text or text == "-" or text == "":
-        return "---"
+# 表示无数据的占位文本
+_MISSING_TEXTS = frozenset(("---", "-", ""))
+
+
+# 按列整体解析数值数据（percentage为True时先去除末尾的百分号）：
+# 无数据的占位文本返回"---"，无法解析的文本原样返回
+def parse_numeric_column(texts, percentage=False):
+    series = pd.Series(texts, dtype=object).str.strip()
+    numeric_text = series.str.replace(r"%$", "", regex=True) if percentage else series
+    values = pd.to_numeric(numeric_text, errors="coerce").astype(float)
+    parsed = values.astype(object).where(values.notna(), series)
+    parsed = parsed.where(~series.isin(_MISSING_TEXTS), "---").tolist()
+    # pd.to_numeric不认识但float()能解析的写法（如"1_000"、"nan"）逐个回退到float()
+    for index in values.index[values.isna()]:
+        if parsed[index] != "---":
+            try:
+                parsed[index] = float(numeric_text[index])
+            except ValueError:
+                pass
+    return parsed
+
+
+# 拦截请求：中止不需要的资源类型和广告统计域名的请求，其余请求正常放行
+async def block_unneeded_requests(route):
+    request = route.request
+    if request.resource_type not in ALLOWED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 构造指定页码的排名页面URL
+def build_page_url(page_num):
+    return f"{BASE_URL}#tct;c{page_num-1};r;s1nzf;ddesc;pn10000;"
+
+
+# 从分页控件获取总页数，无法获取时保守估计为1页
+async def get_total_pages(page):
     try:
-        # 去除百分号并转换为浮点数
-        if text.endswith("%"):
-            return float(text[:-1])
-        else:
-            return float(text)
-    except:
-        return text
+        pagination_text = await page.evaluate(
+            "() => document.querySelector('.pnum').textContent"
+        )
+        match = _PAGINATION_RE.search(pagination_text)
+        if match:
+            total_pages = int(match.group(1))
+            print(f"获取到总页数: {total_pages}")
+            return total_pages
+    except Exception as e:
+        print(f"获取总页数时出错: {e}")
+    return 1
+
 
+# 抓取并解析单个排名页面，返回该页的基金数据列表；未找到数据表格时返回None
+async def fetch_page(page, page_num):
+    page_fund_data = []
+    current_url = build_page_url(page_num)
+    print(f"正在处理第 {page_num} 页，URL: {current_url}")
 
-# 解析数值数据
-def parse_numeric_data(text):
-    if text == "---" or not text or text == "-" or text == "":
-        return "---"
+    # 导航到目标页面：DOM解析完成即返回，不再等待网络空闲（页面的广告和统计请求会持续很久）
+    await page.goto(current_url, wait_until="domcontentloaded")
+
+    # 等待表格中出现完整的基金数据行（表格数据由页面脚本按URL中的参数异步加载）
     try:
-        return float(text)
+        await page.wait_for_function(DATA_ROW_READY_JS, timeout=30000)
+        print("成功找到基金数据表格")
     except:
-        return text
+        print(f"第 {page_num} 页未找到基金数据表格，可能没有更多数据或页面结构已更改")
+        return None
+
+    # 获取所有行数据：一次evaluate取回所有行的单元格文本和基金链接
+    rows = await page.evaluate(EXTRACT_ROWS_JS, "#dbtable > tbody > tr")
+    print(f"第 {page_num} 页共找到 {len(rows)} 条基金数据")
+
+    # 同一页的所有行共用当前年份（补全MM-DD格式的日期）和数据获取时间，只计算一次
+    now = datetime.now()
+    current_year = now.year
+    fetch_time = now.strftime("%Y-%m-%d %H:%M:%S")
+
+    # 先筛选出字段完整且数据日期有效的行，数值字段再按列整体解析
+    valid_rows = []
+    for row in rows:
+        # 获取所有单元格的文本
+        cells = row["cells"]
+
+        if len(cells) < 18:  # 确保有足够的字段
+            if DEBUG:
+                print(f"行数据字段不足，跳过该行")
+            continue
+
+        # 获取数据日期（数据日期）
+        # 根据用户要求：数据日期指的是最新交易日数据产生的日期，
+        # 从表格单元格中获取，具体为取基金类型的下一位数据（cells[5]）
+        data_date = ""  # 初始化为空字符串
+
+        # 处理日期格式，可能是 MM-DD 或 YYYY-MM-DD
+        latest_date_text = cells[5].strip()
+        if len(latest_date_text) == 5 and latest_date_text[2] == "-":
+            # MM-DD 格式，添加当前年份
+            data_date = f"{current_year}-{latest_date_text}"
+        elif (
+            len(latest_date_text) == 10
+            and latest_date_text[4] == "-"
+            and latest_date_text[7] == "-"
+        ):
+            # YYYY-MM-DD 格式
+            data_date = latest_date_text
+
+        # 如果未能获取到有效的日期，则标记为无效
+        if not data_date:
+            if DEBUG:
+                print(f"未能从表格获取有效日期，跳过该行")
+            continue
+
+        valid_rows.append((row, data_date))
+
+    numeric_rows = list(
+        zip(
+            *(
+                parse_numeric_column(
+                    [row["cells"][index] for row, _ in valid_rows], percentage
+                )
+                for index, percentage in NUMERIC_CELLS
+            )
+        )
+    )
+
+    processed_rows = 0
+
+    # 处理每行数据
+    for (row, data_date), numeric_row in zip(valid_rows, numeric_rows):
+        try:
+            # 获取所有单元格的文本
+            cells = row["cells"]
+
+            # 提取各个字段数据
+            fund_code = "---"
+
+            # 首先打印单元格数量，帮助调试
+            if DEBUG:
+                print(f"当前行有 {len(cells)} 个单元格")
+
+            # 正确提取基金代码的逻辑
+            # 基金代码通常在链接中：第3个单元格中有<a>标签时，取其href属性
+            if row["has_link"]:
+                # 从链接中提取基金代码（通常是6位数字）
+                fund_code_match = _SIX_DIGITS.search(row["href"] or "")
+                if fund_code_match:
+                    fund_code = fund_code_match.group(0)
+
+            # 如果上面的方法没有获取到基金代码，尝试使用第2个单元格的文本
+            if fund_code == "---":
+                # 检查是否是6位数字的基金代码格式
+                fund_code_match = _SIX_DIGITS.search(cells[1])
+                if fund_code_match:
+                    fund_code = fund_code_match.group(0)
+
+            # 基金简称、基金类型、成立日期信息
+            fund_name = cells[3].strip()
+            fund_type = cells[4].strip()
+            establishment_date = cells[17].strip()
+
+            # 最新单位净值、最新累计净值、近1周至成立来各阶段增长率（第7至17个单元格，已按列解析）
+            (
+                unit_nav,
+                accum_nav,
+                week_growth,
+                month_growth,
+                quarter_growth,
+                half_year_growth,
+                year_growth,
+                two_year_growth,
+                three_year_growth,
+                year_to_date_growth,
+                since_establishment_growth,
+            ) = numeric_row
+
+            # 构建基金数据字典，严格按照用户提供的固定顺序映射
+            # 固定顺序: [基金代码, 基金简称, 基金类型, 数据获取日期, 最新单位净值, 最新累计净值, 近1周增长率, 近1月增长率, 近3月增长率, 近6月增长率, 近1年增长率, 近2年增长率, 近3年增长率, 今年来增长率, 成立来增长率, 成立日期信息]
+            fund_data = {
+                "fund_code": fund_code,
+                "fund_name": fund_name if fund_name else "---",
+                "fund_type": fund_type if fund_type else "---",
+                "data_date": data_date,  # 数据获取日期，使用完整日期格式
+                "unit_nav": unit_nav,
+                "accum_nav": accum_nav,
+                "week_growth": week_growth,
+                "month_growth": month_growth,
+                "quarter_growth": quarter_growth,
+                "half_year_growth": half_year_growth,
+                "year_growth": year_growth,
+                "two_year_growth": two_year_growth,
+                "three_year_growth": three_year_growth,
+                "year_to_date_growth": year_to_date_growth,
+                "since_establishment_growth": since_establishment_growth,
+                "establishment_date": (
+                    establishment_date if establishment_date else "---"
+                ),
+                "fetch_time": fetch_time,
+            }
+
+            # 添加到结果列表
+            page_fund_data.append(fund_data)
+            processed_rows += 1
+
+        except Exception as e:
+            print(f"处理某条基金数据时出错: {e}")
+            continue
+
+    print(f"第 {page_num} 页处理完成，共处理 {processed_rows} 条有效基金数据")
+    return page_fund_data
+
+
+# 在共享的浏览器上下文中新开标签页抓取指定页面，通过信号量限制同时打开的标签页数量
+async def fetch_page_in_new_tab(context, page_num, semaphore):
+    async with semaphore:
+        page = await context.new_page()
+        try:
+            return await fetch_page(page, page_num)
+        finally:
+            await page.close()
 
 
 # 使用Playwright获取场内交易基金数据
 async def fetch_fbs_fund_data():
     fund_data_list = []
     try:
-        # 设置初始页面
-        page_num = 1
-        total_pages = 1  # 初始值，后续会从网页中获取实际值
-        total_processed = 0
-        base_url = "https://fund.eastmoney.com/data/fbsfundranking.html"
-        current_url = f"{base_url}#tct;c0;r;s1nzf;ddesc;pn10000;"
-
         # 使用Playwright启动浏览器
         async with async_playwright() as p:
             print("正在启动浏览器...")
@@ -170,331 +417,45 @@ async def fetch_fbs_fund_data():
                 ],
             )
 
-            # 在创建页面时设置user agent
-            page = await browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            )
-
-            # 设置页面加载超时
-            page.set_default_timeout(60000)  # 60秒，注意这不是异步方法，不需要await
-
             try:
-                # 循环处理所有页面
-                while True:
-                    # 如果不是第一页，构造新的URL
-                    if page_num > 1:
-                        current_url = (
-                            f"{base_url}#tct;c{page_num-1};r;s1nzf;ddesc;pn10000;"
+                # 所有标签页共用一个浏览器上下文（设置user agent，复用cookie和缓存）
+                context = await browser.new_context(user_agent=USER_AGENT)
+
+                # 设置页面加载超时：60秒，注意这不是异步方法，不需要await
+                context.set_default_timeout(60000)
+
+                # 在上下文级别拦截不需要的资源，对所有标签页生效
+                await context.route("**/*", block_unneeded_requests)
+
+                # 先处理第1页，并从中获取总页数
+                page = await context.new_page()
+                first_page_data = await fetch_page(page, 1)
+                if first_page_data is not None:
+                    fund_data_list.extend(first_page_data)
+                    total_pages = await get_total_pages(page)
+                    await page.close()
+
+                    # 其余页面并发抓取，结果按页码顺序合并
+                    if total_pages > 1:
+                        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+                        page_nums = range(2, total_pages + 1)
+                        results = await asyncio.gather(
+                            *[
+                                fetch_page_in_new_tab(context, page_num, semaphore)
+                                for page_num in page_nums
+                            ],
+                            return_exceptions=True,
                         )
+                        for page_num, result in zip(page_nums, results):
+                            if isinstance(result, Exception):
+                                print(f"第 {page_num} 页处理出错: {result}")
+                            elif result:
+                                fund_data_list.extend(result)
 
-                    print(f"正在处理第 {page_num} 页，URL: {current_url}")
-
-                    # 导航到目标页面
-                    await page.goto(current_url)
-                    await page.wait_for_load_state("networkidle")  # 等待网络空闲
-
-                    # 等待表格加载完成
-                    try:
-                        await page.wait_for_selector(
-                            "#dbtable > tbody > tr", timeout=10000
-                        )
-                        print("成功找到基金数据表格")
-                    except:
-                        print(
-                            f"第 {page_num} 页未找到基金数据表格，可能没有更多数据或页面结构已更改"
-                        )
-                        break
-
-                    # 获取总页数
-                    if page_num == 1:
-                        try:
-                            # 从分页控件获取总页数
-                            pagination_text = await page.evaluate(
-                                "() => document.querySelector('.pnum').textContent"
-                            )
-                            match = re.search(r"/\s*(\d+)", pagination_text)
-                            if match:
-                                total_pages = int(match.group(1))
-                                print(f"获取到总页数: {total_pages}")
-                        except Exception as e:
-                            print(f"获取总页数时出错: {e}")
-                            # 如果无法获取总页数，保守估计为1页
-                            total_pages = 1
-
-                    # 获取所有行数据
-                    rows = await page.query_selector_all("#dbtable > tbody > tr")
-                    print(f"第 {page_num} 页共找到 {len(rows)} 条基金数据")
-
-                    processed_rows = 0
-
-                    # 处理每行数据
-                    for row in rows:
-                        try:
-                            # 获取所有单元格
-                            cells = await row.query_selector_all("td")
-
-                            if len(cells) < 18:  # 确保有足够的字段
-                                print(f"行数据字段不足，跳过该行")
-                                continue
-
-                            # 获取数据日期（数据日期）
-                            # 根据用户要求：数据日期指的是最新交易日数据产生的日期，
-                            # 从表格单元格中获取，具体为取基金类型的下一位数据（cells[5]）
-                            data_date = ""  # 初始化为空字符串
-
-                            # 安全地从表格单元格中获取数据日期
-                            try:
-                                if (
-                                    len(cells) >= 6
-                                ):  # 确保有足够的单元格获取数据日期（基金类型下一位）
-                                    latest_date_text = await cells[5].text_content()
-                                    latest_date_text = latest_date_text.strip()
-                                    # 处理日期格式，可能是 MM-DD 或 YYYY-MM-DD
-                                    if (
-                                        len(latest_date_text) == 5
-                                        and latest_date_text[2] == "-"
-                                    ):
-                                        # MM-DD 格式，添加当前年份
-                                        current_year = datetime.now().year
-                                        data_date = f"{current_year}-{latest_date_text}"
-                                    elif (
-                                        len(latest_date_text) == 10
-                                        and latest_date_text[4] == "-"
-                                        and latest_date_text[7] == "-"
-                                    ):
-                                        # YYYY-MM-DD 格式
-                                        data_date = latest_date_text
-                            except:
-                                # 异常情况下保持data_date为空
-                                pass
-
-                            # 如果未能获取到有效的日期，则标记为无效
-                            if not data_date:
-                                print(f"未能从表格获取有效日期，跳过该行")
-                                continue
-
-                            # 提取各个字段数据 - 使用安全的方式访问单元格
-                            fund_code = "---"
-                            fund_name = "---"
-                            fund_type = "---"
-                            unit_nav = "---"
-                            accum_nav = "---"
-                            week_growth = "---"
-                            month_growth = "---"
-                            quarter_growth = "---"
-                            half_year_growth = "---"
-                            year_growth = "---"
-                            two_year_growth = "---"
-                            three_year_growth = "---"
-                            year_to_date_growth = "---"
-                            since_establishment_growth = "---"
-                            establishment_date = "---"
-
-                            # 安全地访问各个字段，根据实际网页结构调整索引
-                            try:
-                                # 首先打印单元格数量，帮助调试
-                                print(f"当前行有 {len(cells)} 个单元格")
-
-                                # 正确提取基金代码的逻辑
-                                # 基金代码通常在链接中或特定元素中
-                                if len(cells) >= 3:  # 尝试从第3个单元格获取基金代码链接
-                                    try:
-                                        # 查找单元格中的<a>标签
-                                        fund_link = await cells[2].query_selector("a")
-                                        if fund_link:
-                                            # 获取链接的href属性
-                                            href = await fund_link.get_attribute("href")
-                                            # 从链接中提取基金代码（通常是6位数字）
-                                            fund_code_match = re.search(r"\d{6}", href)
-                                            if fund_code_match:
-                                                fund_code = fund_code_match.group(0)
-                                    except:
-                                        # 如果无法从链接中获取，尝试直接获取文本
-                                        if len(cells) >= 3:
-                                            fund_code = await cells[2].text_content()
-
-                                # 如果上面的方法没有获取到基金代码，尝试使用第2个单元格的文本
-                                if fund_code == "---" and len(cells) >= 2:
-                                    fund_code_text = await cells[1].text_content()
-                                    # 检查是否是6位数字的基金代码格式
-                                    fund_code_match = re.search(
-                                        r"\d{6}", fund_code_text
-                                    )
-                                    if fund_code_match:
-                                        fund_code = fund_code_match.group(0)
-
-                                # 基金简称
-                                if len(cells) >= 4:  # 基金简称
-                                    fund_name = await cells[3].text_content()
-
-                                # 基金类型
-                                if len(cells) >= 5:  # 基金类型
-                                    fund_type = await cells[4].text_content()
-
-                                # 最新单位净值
-                                if len(cells) >= 7:  # 最新单位净值
-                                    unit_nav_text = await cells[6].text_content()
-                                    unit_nav = parse_numeric_data(unit_nav_text.strip())
-
-                                # 最新累计净值
-                                if len(cells) >= 8:  # 最新累计净值
-                                    accum_nav_text = await cells[7].text_content()
-                                    accum_nav = parse_numeric_data(
-                                        accum_nav_text.strip()
-                                    )
-
-                                # 近1周增长率
-                                if len(cells) >= 9:  # 近1周增长率
-                                    week_growth_text = await cells[8].text_content()
-                                    week_growth = parse_percentage_data(
-                                        week_growth_text.strip()
-                                    )
-
-                                # 近1月增长率
-                                if len(cells) >= 10:  # 近1月增长率
-                                    month_growth_text = await cells[9].text_content()
-                                    month_growth = parse_percentage_data(
-                                        month_growth_text.strip()
-                                    )
-
-                                # 近3月增长率
-                                if len(cells) >= 11:  # 近3月增长率
-                                    quarter_growth_text = await cells[10].text_content()
-                                    quarter_growth = parse_percentage_data(
-                                        quarter_growth_text.strip()
-                                    )
-
-                                # 近6月增长率
-                                if len(cells) >= 12:  # 近6月增长率
-                                    half_year_growth_text = await cells[
-                                        11
-                                    ].text_content()
-                                    half_year_growth = parse_percentage_data(
-                                        half_year_growth_text.strip()
-                                    )
-
-                                # 近1年增长率
-                                if len(cells) >= 13:  # 近1年增长率
-                                    year_growth_text = await cells[12].text_content()
-                                    year_growth = parse_percentage_data(
-                                        year_growth_text.strip()
-                                    )
-
-                                # 近2年增长率
-                                if len(cells) >= 14:  # 近2年增长率
-                                    two_year_growth_text = await cells[
-                                        13
-                                    ].text_content()
-                                    two_year_growth = parse_percentage_data(
-                                        two_year_growth_text.strip()
-                                    )
-
-                                # 近3年增长率
-                                if len(cells) >= 15:  # 近3年增长率
-                                    three_year_growth_text = await cells[
-                                        14
-                                    ].text_content()
-                                    three_year_growth = parse_percentage_data(
-                                        three_year_growth_text.strip()
-                                    )
-
-                                # 今年来增长率
-                                if len(cells) >= 16:  # 今年来增长率
-                                    year_to_date_growth_text = await cells[
-                                        15
-                                    ].text_content()
-                                    year_to_date_growth = parse_percentage_data(
-                                        year_to_date_growth_text.strip()
-                                    )
-
-                                # 成立来增长率
-                                if len(cells) >= 17:  # 成立来增长率
-                                    since_establishment_growth_text = await cells[
-                                        16
-                                    ].text_content()
-                                    since_establishment_growth = parse_percentage_data(
-                                        since_establishment_growth_text.strip()
-                                    )
-
-                                # 成立日期信息
-                                if len(cells) >= 18:  # 成立日期信息
-                                    establishment_date_text = await cells[
-                                        17
-                                    ].text_content()
-                                    establishment_date = (
-                                        establishment_date_text.strip()
-                                        if establishment_date_text.strip()
-                                        and establishment_date_text.strip() != "---"
-                                        else "---"
-                                    )
-                            except Exception as e:
-                                print(f"提取字段数据时出错: {e}")
-
-                            # 构建基金数据字典，严格按照用户提供的固定顺序映射
-                            # 固定顺序: [基金代码, 基金简称, 基金类型, 数据获取日期, 最新单位净值, 最新累计净值, 近1周增长率, 近1月增长率, 近3月增长率, 近6月增长率, 近1年增长率, 近2年增长率, 近3年增长率, 今年来增长率, 成立来增长率, 成立日期信息]
-                            fund_data = {
-                                "fund_code": (
-                                    fund_code.strip()
-                                    if fund_code.strip() and fund_code.strip() != "---"
-                                    else "---"
-                                ),
-                                "fund_name": (
-                                    fund_name.strip()
-                                    if fund_name.strip() and fund_name.strip() != "---"
-                                    else "---"
-                                ),
-                                "fund_type": (
-                                    fund_type.strip()
-                                    if fund_type.strip() and fund_type.strip() != "---"
-                                    else "---"
-                                ),
-                                "data_date": data_date,  # 数据获取日期，使用完整日期格式
-                                "unit_nav": unit_nav,
-                                "accum_nav": accum_nav,
-                                "week_growth": week_growth,
-                                "month_growth": month_growth,
-                                "quarter_growth": quarter_growth,
-                                "half_year_growth": half_year_growth,
-                                "year_growth": year_growth,
-                                "two_year_growth": two_year_growth,
-                                "three_year_growth": three_year_growth,
-                                "year_to_date_growth": year_to_date_growth,
-                                "since_establishment_growth": since_establishment_growth,
-                                "establishment_date": establishment_date,
-                                "fetch_time": datetime.now().strftime(
-                                    "%Y-%m-%d %H:%M:%S"
-                                ),
-                            }
-
-                            # 添加到结果列表
-                            fund_data_list.append(fund_data)
-                            processed_rows += 1
-
-                            # 每处理100条数据打印一次进度
-                            if processed_rows % 100 == 0:
-                                print(f"第 {page_num} 页已处理 {processed_rows} 条数据")
-
-                        except Exception as e:
-                            print(f"处理某条基金数据时出错: {e}")
-                            continue
-
-                    # 更新累计处理数量
-                    total_processed += processed_rows
                     print(
-                        f"第 {page_num} 页处理完成，共处理 {processed_rows} 条有效基金数据，累计处理 {total_processed} 条"
+                        f"已处理完所有 {total_pages} 页数据，累计处理 {len(fund_data_list)} 条"
                     )
 
-                    # 检查是否还有下一页
-                    if page_num >= total_pages:
-                        print(f"已处理完所有 {total_pages} 页数据")
-                        break
-
-                    # 处理下一页
-                    page_num += 1
-
-                    # 添加适当的延迟，避免请求过于频繁
-                    await page.wait_for_timeout(2000)  # 等待2秒
-
             except Exception as e:
                 print(f"使用Playwright获取数据时出错: {e}")
                 import traceback
@@ -550,7 +511,7 @@ def query_fbs_fund():
     fund_code = input("请输入场内交易基金代码: ").strip()
     
     # 验证基金代码格式（6位数字）
-    if not re.match(r"^\d{6}$", fund_code):
+    if not _SIX_DIGITS.fullmatch(fund_code):
         print("错误：基金代码格式不正确，请输入6位数字的基金代码")
         return
     
@@ -593,10 +554,9 @@ def show_all_fund_codes():
         if exit_view:
             break
             
+        # 每页拼接成一行后只输出一次
         page_codes = all_fund_codes[i:i+page_size]
-        for code in page_codes:
-            print(code, end='  ')
-        print()
+        print('  '.join(page_codes))
         
         if i + page_size < len(all_fund_codes):
             user_input = input("按Enter键查看下一页... 或按'q'退出查看: ").strip().lower()
@@ -114,7 +114,12 @@ class FundQuantAnalysisReport:
                 group = hf[fund_code]
                 
                 # 读取数据并转换为DataFrame
-                dates = [d.decode('utf-8') if isinstance(d, bytes) else str(d) for d in group['date'][()]]
+                dates = group['date'][()]
+                # 定长字节串日期数组通过np.char.decode在C层批量解码，其他类型逐个转换
+                if dates.dtype.kind == 'S':
+                    dates = np.char.decode(dates, 'utf-8')
+                else:
+                    dates = [d.decode('utf-8') if isinstance(d, bytes) else str(d) for d in dates]
                 
                 df = pd.DataFrame({
                     'date': pd.to_datetime(dates),
@@ -151,7 +156,12 @@ class FundQuantAnalysisReport:
                     group = hf_new[fund_code]
                     
                     # 读取数据并转换为DataFrame
-                    dates = [d.decode('utf-8') if isinstance(d, bytes) else str(d) for d in group['date'][()]]
+                    dates = group['date'][()]
+                    # 定长字节串日期数组通过np.char.decode在C层批量解码，其他类型逐个转换
+                    if dates.dtype.kind == 'S':
+                        dates = np.char.decode(dates, 'utf-8')
+                    else:
+                        dates = [d.decode('utf-8') if isinstance(d, bytes) else str(d) for d in dates]
                     
                     df = pd.DataFrame({
                         'date': pd.to_datetime(dates),